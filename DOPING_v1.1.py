@@ -10,7 +10,9 @@ HOW TO USE (basics):
 PREREQUISITES: This program should be ran with the newest versions that were available at the date of last edit of numpy, random, and time. These packages should be installed by the user prior to running DOPING. This program was made to work in Python 3.10.
 SOLVE: Use by calling solve([number_of_rows, number_of_columns]) on line 389. For other options and details, use help(solve).
 CREATE: Use by calling create_puzzle([[number_of_rows, number_of_columns]) on line 391. For other options and details, use help(create_puzzle).
-I advise to create puzzles with a maxiumum number of 42 positions as it takes very long to solve bigger fields.
+GENERATE: To make many puzzles with exactly one solution at once, without any input, use generate_puzzles() or the command line: python DOPING_v1.1.py generate number_of_rows number_of_columns --count 100 --seed 1 --output puzzles.jsonl (one puzzle with its solution per line). For other options, use --help.
+BENCHMARK: To measure the speed of the search on a fixed set of seeded puzzles, use benchmark() or the command line: python DOPING_v1.1.py benchmark --output results.json. Run it again after a change with --baseline results.json to see which cases got slower.
+I advise to create puzzles with a maxiumum number of 42 positions as it takes very long to solve bigger fields. Long narrow fields (such as 3x40 or 4x25) are the exception, as they are solved with the frontier engine.
 
 HOW THE PUZZLE GAME WORKS
 DoPing (pronounce: do pie'ing) is a game where your goal is to fill the playing field with a string of the digits of π (31415926...) starting at 3, then going to 1 in one of the surrounding four fields,then to 4, to 1, to 5, etc.
@@ -24,360 +26,2186 @@ To get an example of what a solution looks like, create a puzzle (e.g. with crea
 FUNCTIONALITY:
 - Solves DoPing puzzles (if possible :)
 - DoPing puzzle maker (creates puzzles for user to solve)
-- (User adjustable) time limit to prevent infinite tries
+- Puzzles with exactly one solution: counts the solutions of a puzzle (stopping at two) and pre-sets only the digits needed to make the solution unique (unique option of create_puzzle(), or generate_puzzle() which needs no user input)
+- (User adjustable) time limit to prevent infinite tries, which also stops the search from one starting position when the time is up, and an optional maximum number of positions to fill in (node_budget option of solve())
+- Use from other programs: search_puzzle() returns the outcome (with the search statistics, also when stopped) instead of printing it, and solve_async() searches in the background for asyncio programs, with requests for the same puzzle sharing one search and the latest outcomes kept
 - Shows starting field and position together with the solution when having found the solution
 - Shows how long code took to run
-- Debugging options: printed log of all moves and/or field after each step
-- Support for fields with up to 115 squares (although this might take very much to (not) solve)
+- Debugging options: printed log of all moves and/or field after each step, and hooks that follow the search (SearchHooks, hooks option of solve()), e.g. to count the positions filled in and taken back per step, time every starting position and write a sampled trace of the search (SearchProfile)
+- Choice of search engine: a fast engine using precomputed neighbour tables and bitmasks (default), or the original numpy engine (needed for the debugging options). Both find the same solution for the same random seed (with pruning off). Long narrow fields are solved with a third engine that sweeps the field column by column and searches all starting positions at once (frontier engine, chosen automatically).
+- Pruning of moves after which the route can't be finished (dead ends and empty positions split into parts), with statistics of how much was skipped (show_statistics option of solve()). Optionally tries moves in Warnsdorff order (fewest empty neighbours first).
+- Support for fields of any size (although big fields might take very much to (not) solve). The digits of pi are computed when needed and cached on disk.
 - Start position can be either user input or automatic
+- Structural starting positions (start_position="all"): goes through every starting position once instead of choosing random ones, skipping positions that are turned copies of others or can't lead to a solution, and tells for sure when a puzzle is unsolvable
+- Parallel search with multiple processes (workers option of solve()): random starting positions are divided over the processes, or for a given starting position the routes of the first few moves are. The first process to find a solution stops the others.
 - Support for pre-set digits to solve puzzles with initial digits given. This also allows for users to input semi-solved puzzles when they get stuck solving it by themselves.
+- Hint option (hint()): shows only the next position of the route or a random yet unsolved position of a partly solved puzzle. Solutions are kept per puzzle, so when the digits filled in agree with a kept solution the hint is given right away; otherwise the search goes on from the route filled in so far
 - Ability to show field when puzzle is created
 - Option to create another puzzle with the same dimensions and number of pre-filled digits
-- Check that the input field is not the unsolvable [5,5], [4,4] or [7,7] (these fields have no solutions). Please contact w.m.trieling@student.utwente.nl if you find any other unsolvable field dimensions.
+- Bulk generation of puzzles (generate_puzzles() or the generate command): puzzles are made one by one as they are written away, optionally in a pool of processes, and the same seed gives the same puzzles
+- Benchmark (benchmark() or the benchmark command): times solving and generating on a fixed set of seeded cases, with the number of positions filled in and taken back and the peak memory use, written as JSON and compared with earlier results
+- Storage for puzzles (doping_storage.py, or the --binary option of the generate command): puzzles and their solutions are packed in a few bytes each, and any stored puzzle can be read without loading the rest of the file
+- Check that the input field has solutions: fields up to 10x10 (except 10x10 itself) are looked up in the atlas of fields with and without solutions (doping_atlas.json, made with build_atlas() or the atlas command), other fields are checked against the unsolvable [5,5], [4,4] and [7,7]. The atlas also holds a solution of every solvable field, which create_puzzle() can start from instead of searching (use_atlas option). Please contact w.m.trieling@student.utwente.nl if you find any other unsolvable field dimensions.
 
 POSSIBLE FUTURE ADDITIONS IN THE COMING MONTHS:
-- Hint option (shows only the next field or a random yet unsolved field)
-- Structural starting positions (goes through all possible starting positions instead of choosing random ones with the possibility of double testing some while missing others).
-- Storage for puzzles
 - Prettier user interface
 
 For further information, contact woutertrieling@gmail.com
 '''
 
 import numpy as np
+import argparse
+import asyncio
+import json
+import mmap
+import multiprocessing
+import os
+import platform
 import random
+import sys
+import threading
 import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+from itertools import permutations
+from math import isqrt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from time import perf_counter
-pi = "314159265358979323846264338327950288419716939937510582097494459230781640628620899862803482534211706798214808653282306647"
-field = []
-n = 0 #current progress quantifier
-r = [] #row
-c = [] #column
-position = [] #[row, column in field matrix]
-moves = [] #keeps track of route and tried options from that position. List items: [position, count, order, digit]
-unsolved_field = [] #list to store unsolved field
-display_field = [] #field with string items instead of integers
-coordinates = [] #list to store locations with pre-set digits
-failed_sp = 0 #counter for unsuccesful starting positions
-
-def reset_variables():
-    """
-    Reset global variables
-    """
-    global field
-    global n
-    global r
-    global r
-    global c
-    global position
-    global moves
-    global unsolved_field
-    global display_field
-    global coordinates
-    global failed_sp
-    field = []
-    n = 0  # current progress quantifier
-    r = []  # row
-    c = []  # column
-    position = []  # [row, column in field matrix]
-    moves = []  # keeps track of route and tried options from that position. List items: [position, count, order, digit]
-    unsolved_field = []  # list to store unsolved field
-    display_field = []  # field with string items instead of integers
-    coordinates = []  # list to store locations with pre-set digits
-    failed_sp = 0  # counter for unsuccesful starting positions
+pi = "314159265358979323846264338327950288419716939937510582097494459230781640628620899862803482534211706798214808651328230664" #first digits of pi, to check the digits from pi_digits()
+pi_cache_file = os.path.join(os.environ.get("DOPING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "doping")), "pi_digits.bin") #one byte per digit of pi
+pi_digit_cache = array("b") #digits of pi read from or written to pi_cache_file in this run
+engines = ["auto", "bitboard", "numpy", "frontier"] #search engines that solve() and create_puzzle() can use
+frontier_width = 4 #engine "auto" uses the frontier engine for fields of at most this many rows (or columns)...
+frontier_ratio = 5 #...that are at least this many times as long as they are wide, see engine_check()
+neighbour_tables_cache = {} #precomputed neighbour tables per field shape, see neighbour_tables()
+pi_index_cache = {} #steps of each digit in pi per field size, see pi_index()
+process_pool = None #process pool for parallel searches, reused across calls, see get_process_pool()
+process_pool_workers = 0 #number of processes in process_pool
+process_pool_cancel = None #event that tells the processes in process_pool to stop searching
+worker_cancel = None #process_pool_cancel as seen from within a process of the pool
+stop_check_interval = 1024 #number of steps between checks of DopingSolver.stop and DopingSolver.node_budget
+move_orders = list(permutations(range(4))) #the 24 orders in which right, down, left and up can be tried, see DopingSolver.move_order()
+atlas_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "doping_atlas.json") #which fields have a solution, see build_atlas()
+atlas_cache = None #atlas_file as read in this run, see atlas_entry()
+solve_cache = OrderedDict() #outcomes of solve_async() per puzzle, the most recently used last
+solve_cache_size = 256 #maximum number of puzzles in solve_cache
+solve_requests = {} #searches of solve_async() that are running, per puzzle
+hint_cache = OrderedDict() #solutions found by hint() per puzzle, the most recently used last
+hint_cache_size = 256 #maximum number of puzzles in hint_cache
+benchmark_matrix = [ #cases that benchmark() runs by default, see benchmark_case()
+    {"task": "solve", "dimensions": [6, 8], "clues": 0, "start": "fixed", "engine": "bitboard", "seed": 1},
+    {"task": "solve", "dimensions": [6, 8], "clues": 0, "start": "fixed", "engine": "bitboard", "seed": 2},
+    {"task": "solve", "dimensions": [7, 8], "clues": 0, "start": "fixed", "engine": "bitboard", "seed": 1},
+    {"task": "solve", "dimensions": [7, 8], "clues": 4, "start": "fixed", "engine": "bitboard", "seed": 1},
+    {"task": "solve", "dimensions": [8, 6], "clues": 2, "start": "all", "engine": "bitboard", "seed": 1},
+    {"task": "solve", "dimensions": [5, 6], "clues": 0, "start": "random", "engine": "bitboard", "seed": 1},
+    {"task": "solve", "dimensions": [6, 6], "clues": 0, "start": "fixed", "engine": "numpy", "seed": 1},
+    {"task": "solve", "dimensions": [3, 60], "clues": 0, "start": "all", "engine": "frontier", "seed": 1},
+    {"task": "solve", "dimensions": [4, 10], "clues": 2, "start": "all", "engine": "frontier", "seed": 1},
+    {"task": "generate", "dimensions": [5, 6], "clues": 2, "start": "random", "engine": "auto", "seed": 1},
+    {"task": "generate", "dimensions": [6, 6], "clues": 2, "start": "random", "engine": "auto", "seed": 2},
+]
+
+def compute_pi_digits(count):
+    """
+    Compute the first count digits of pi (starting with the 3) with the Chudnovsky series, summed by binary splitting.
+    :param count: number of digits
+    :return: string of digits
+    """
+    def split(a, b): #sum of the terms a up to b as integers P, Q, T
+        if b - a == 1:
+            if a == 0:
+                P = Q = 1
+            else:
+                P = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+                Q = a * a * a * 10939058860032000 #640320**3 / 24
+            T = P * (13591409 + 545140134 * a)
+            if a % 2 == 1:
+                T = -T
+            return P, Q, T
+        m = (a + b) // 2
+        P1, Q1, T1 = split(a, m)
+        P2, Q2, T2 = split(m, b)
+        return P1 * P2, Q1 * Q2, T1 * Q2 + P1 * T2
+    def to_string(x, length): #decimal string of x with length digits, in parts as str() refuses very long integers in newer Python versions
+        if length <= 1000:
+            return str(x).zfill(length)
+        high, low = divmod(x, 10 ** (length // 2))
+        return to_string(high, length - length // 2) + to_string(low, length // 2)
+    precision = count + 10 #extra digits against rounding in the last digits
+    P, Q, T = split(0, precision // 14 + 2) #every term adds a bit more than 14 digits
+    one = 10 ** precision
+    digits = to_string(Q * 426880 * isqrt(10005 * one * one) // T, precision + 1)
+    return digits[0: count]
+
+def pi_digits(count):
+    """
+    Get the first count digits of pi as integers. The digits are cached in pi_cache_file, which is memory-mapped so only the digits needed are read.
+    When the cache doesn't have enough digits, more are computed with compute_pi_digits() and the cache file is replaced.
+    :param count: number of digits
+    :return: array of integer digits, starting with the 3
+    """
+    global pi_digit_cache
+    if len(pi_digit_cache) >= count:
+        return pi_digit_cache[0: count]
+    try:
+        with open(pi_cache_file, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as cache:
+                if len(cache) >= count:
+                    pi_digit_cache = array("b", cache[0: count])
+    except (OSError, ValueError): #no cache file yet, or an empty one
+        pass
+    check = min(count, len(pi))
+    if len(pi_digit_cache) < count or bytes(pi_digit_cache[0: check]) != bytes(int(y) for y in pi[0: check]): #not enough digits or a damaged cache
+        pi_digit_cache = array("b", (int(y) for y in compute_pi_digits(max(count, 2 * len(pi_digit_cache), 1024))))
+        try:
+            os.makedirs(os.path.dirname(pi_cache_file), exist_ok=True)
+            with open(pi_cache_file + ".tmp", "wb") as file:
+                file.write(pi_digit_cache.tobytes())
+            os.replace(pi_cache_file + ".tmp", pi_cache_file)
+        except OSError: #can't write the cache, keep the digits for this run only
+            pass
+    return pi_digit_cache[0: count]
+
+def atlas_entry(field_dimensions):
+    """
+    Looks up a field in the atlas made by build_atlas(). The atlas file is read once per run.
+    :param field_dimensions: [number of rows, number of columns]
+    :return: {"solvable": True or False, and for solvable fields "start": [row, column] and "path": the moves as a string of R, D, L and U (right, down, left, up)}, or None if the field is not in the atlas
+    """
+    global atlas_cache
+    if atlas_cache is None:
+        try:
+            with open(atlas_file) as f:
+                atlas_cache = json.load(f)
+        except (OSError, ValueError): #no atlas built yet, or a damaged one
+            atlas_cache = {}
+    return atlas_cache.get(f"{field_dimensions[0]}x{field_dimensions[1]}")
+
+def atlas_witness(field_dimensions, rng = random):
+    """
+    Gives the solution of a field stored in the atlas (see build_atlas()), turned by a random rotation or reflection of the field (see symmetries()).
+    :param field_dimensions: [number of rows, number of columns]
+    :param rng: random.Random instance for choosing the turn. Default is the random module.
+    :return: path of the solution as a list of [row, column] positions, or None if the atlas has no solution for the field
+    """
+    entry = atlas_entry(field_dimensions)
+    if entry is None or entry["solvable"] == False:
+        return None
+    path = [list(entry["start"])]
+    for move in entry["path"]:
+        dr, dc = {"R": (0, 1), "D": (1, 0), "L": (0, -1), "U": (-1, 0)}[move]
+        path.append([path[-1][0] + dr, path[-1][1] + dc])
+    turn = rng.choice(symmetries(field_dimensions))
+    return [turn(r, c) for r, c in path]
+
+def field_issue(field_dimensions, number_of_prefilled):
+    """
+    Initial check of whether the field can be created, without printing (see field_check())
+    Fields in the atlas (see build_atlas()) are checked with the atlas, other fields with the fields known to have no solutions.
+    :param field_dimension: [r,c]
+    :param number_of_prefilled: number of digits, or number of preset digits
+    :return: why the field can't be created, or None if it can
+    """
+    entry = atlas_entry(field_dimensions)
+    if entry is not None and entry["solvable"] == False or entry is None and field_dimensions in [[5,5], [4,4], [7,7]]: #fields without solutions (update if necessary)
+        return f"There are no solutions for a {field_dimensions} field."
+    if number_of_prefilled > field_dimensions[0]*field_dimensions[1]: #check if number of (pre-set) digits exceeds the number of locations in field.
+        return "You have more pre-filled digits than the number of positions in the field."
+    return None
 
 def field_check(field_dimensions, number_of_prefilled):
     """
-    Initial check of whether the field can be created
+    Initial check of whether the field can be created, printing why not
     :param field_dimension: [r,c]
     :param number_of_prefilled: number of digits, or number of preset digits
     :return: True or False
     """
-    if field_dimensions == [5,5] or field_dimensions == [4,4] or field_dimensions == [7,7]: #fields without solutions (update if necessary)
-        print(f"There are no solutions for a {field_dimensions} field.")
-        return False
-    if number_of_prefilled > field_dimensions[0]*field_dimensions[1]: #check if number of (pre-set) digits exceeds the number of locations in field.
-        print("You have more pre-filled digits than the number of positions in the field.")
+    issue = field_issue(field_dimensions, number_of_prefilled)
+    if issue is not None:
+        print(issue)
         return False
     return True
 
-def create_field(field_dimensions, pre_set):
-    """
-    Create the field, display_field and unsolved_field with, if applicable, the pre_set digits set
-    :param field_dimensions: (number of rows, number of columns)
-    :param pre_set: list coordinates and corresponding digits of pre_set fields
-    :return: "fields made" when succesful, "impossible" when pre-set positions are out of bounds
-    """
-    global field
-    global unsolved_field
-    global coordinates
-    global display_field
-    field = -1 * np.ones((field_dimensions[0], field_dimensions[1]), dtype=int) #create field
-    display_field = np.full((field_dimensions[0], field_dimensions[1]), '_', str) #create display field
-    if pre_set == [0]: #no pre-set
-        unsolved_field = field.copy() #store the unsolved field
-    else:
-        coordinates = [x[0] for x in pre_set] #split preset lists for coordinates and digits
-        digits = [x[1] for x in pre_set]
-        pi_int_list = ([int(y) for y in pi])
-        j = 0
-        while j < len(digits): #if the preset digits are not in the possible digits for this size of field, let solve() know it's impossible to solve.
-            if digits[j] not in pi_int_list[0: field.size]:
-                return "impossible"
-            j += 1
-        i = 0
-        while i < len(pre_set): #put the pre-set digits in the field and display field
-            field[coordinates[i][0], coordinates[i][1]] = digits[i]
-            display_field[coordinates[i][0], coordinates[i][1]] = digits[i]
-            i += 1
-        unsolved_field = field.copy() #store the unsolved field
-    return "fields made"
-
-def new_position(count):
-    """
-    Create the coordinates of new positions to check for validity.
-    Follows the standard order right -> down -> left -> up
-    Input moves[n][1] to know which option needs to be checked.
-    :return: proposed position in [r,c] or False if all possible positions have been tried without succes.
-    """
-    r = position[0]
-    c = position[1]
-    order = [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]]  # move options [right, down, left, up]
-    if count == 0:
-        proposed_position = order[moves[n][2][0]]
-    elif count == 1:
-        proposed_position = order[moves[n][2][1]]
-    elif count == 2:
-        proposed_position = order[moves[n][2][2]]
-    elif count == 3:
-        proposed_position = order[moves[n][2][3]]
-    else: #count == 4
-        return False
-    return proposed_position
+def symmetries(field_dimensions, pre_set = [0]):
+    """
+    Lists the rotations and reflections that map the field, including its pre-set digits, onto itself.
+    A solution from one starting position turned this way is a solution from the turned starting position, so only one of them needs to be searched.
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits, see solve()
+    :return: list of functions that turn [row, column] into the [row, column] it is mapped to (the first one keeps the field as it is)
+    """
+    rows, columns = field_dimensions
+    turns = [lambda r, c: [r, c], #as it is
+             lambda r, c: [rows - 1 - r, columns - 1 - c], #rotated half a turn
+             lambda r, c: [rows - 1 - r, c], #mirrored top to bottom
+             lambda r, c: [r, columns - 1 - c]] #mirrored left to right
+    if rows == columns:
+        turns += [lambda r, c: [c, r], #mirrored in the diagonal
+                  lambda r, c: [columns - 1 - c, rows - 1 - r], #mirrored in the other diagonal
+                  lambda r, c: [c, rows - 1 - r], #rotated a quarter turn clockwise
+                  lambda r, c: [columns - 1 - c, r]] #rotated a quarter turn anticlockwise
+    if pre_set == [0]:
+        return turns
+    digits = sorted([x[0], x[1]] for x in pre_set)
+    return [turn for turn in turns if sorted([turn(x[0][0], x[0][1]), x[1]] for x in pre_set) == digits]
 
-def legal_position (proposed_position):
+def pi_index(size):
     """
-    Checking mechanism for legality of new position.
-    Checking for (in order):
-    - if position is within the field;
-    - if position is not already taken;
-    - if the input value won't be the same as that of any of the directly surrounding 8 fields.
-    If legal, the function returns True
-    If not legal, function returns False
+    Precompute for every digit the steps of the route at which it occurs, i.e. its positions in the first size digits of pi.
+    :param size: number of positions in the field
+    :return: list with for every digit 0-9 a list of steps
     """
-    if proposed_position == False:
-        return False
-#Q: is there any reason to use 'else:' like I did here when the if statement includes a return?
-    else:
+    if size not in pi_index_cache:
+        digit_list = pi_digits(size)
+        steps = [[] for digit in range(10)]
+        for k in range(size):
+            steps[digit_list[k]].append(k)
+        pi_index_cache[size] = steps
+    return pi_index_cache[size]
+
+def pre_set_steps(field_dimensions, pre_set, start_position):
+    """
+    Works out at which steps of the route each pre-set digit can be, for a given starting position:
+    - a step with the pre-set digit in pi;
+    - at least as far as the distance (in moves) from the starting position, and with the same parity as that distance, as every move goes to the other colour of the (chess board) field;
+    - for every other pre-set digit there must be a step left that is at least their distance apart.
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits, see solve()
+    :param start_position: [row, column] of the 3
+    :return: dictionary {(row, column): list of possible steps}. An empty list means there is no solution from this starting position.
+    """
+    if pre_set == [0]:
+        return {}
+    index = pi_index(field_dimensions[0] * field_dimensions[1])
+    r, c = start_position
+    steps = {}
+    for [rp, cp], digit in pre_set:
+        distance = abs(rp - r) + abs(cp - c)
+        if distance == 0:
+            steps[(rp, cp)] = [0] if digit == 3 else []
+        else:
+            steps[(rp, cp)] = [k for k in index[digit] if k >= distance and (k - distance) % 2 == 0]
+    changed = True
+    while changed: #remove steps that leave no step for another pre-set digit, until nothing changes
+        changed = False
+        for x in steps:
+            for y in steps:
+                if x == y:
+                    continue
+                distance = abs(x[0] - y[0]) + abs(x[1] - y[1])
+                possible = [k for k in steps[x] if any(abs(k - ky) >= distance for ky in steps[y] if ky != k)]
+                if len(possible) < len(steps[x]):
+                    steps[x] = possible
+                    changed = True
+    return steps
+
+def start_positions(field_dimensions, pre_set = [0], symmetry = True):
+    """
+    Lists every starting position that needs to be searched to know for sure whether the field has a solution, each exactly once.
+    Leaves out:
+    - positions that are a rotation or reflection of a position earlier in the list (see symmetries());
+    - positions of the wrong colour when the field has an odd number of positions. Like on a chess board, every move goes to the other colour, so a route through all positions has to start on the colour with the most positions;
+    - positions from which a pre-set digit can't be reached at a step with its digit (see pre_set_steps()).
+    With pre-set digits, the positions with the most possible steps for the pre-set digits come first.
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits, see solve()
+    :param symmetry: True (default) to leave out turned copies. False keeps them, e.g. to count all solutions (see DopingSolver.count_solutions()).
+    :return: list of [row, column] starting positions
+    """
+    rows, columns = field_dimensions
+    size = rows * columns
+    turns = symmetries(field_dimensions, pre_set) if symmetry else []
+    scored = []
+    for r in range(rows):
+        for c in range(columns):
+            if min((turn(r, c) for turn in turns), default=[r, c]) != [r, c]: #an earlier position is the same after turning the field
+                continue
+            if size % 2 == 1 and (r + c) % 2 == 1:
+                continue
+            score = 1 #number of combinations of steps the pre-set digits could be at
+            for steps in pre_set_steps(field_dimensions, pre_set, [r, c]).values():
+                score *= len(steps)
+            if score > 0:
+                scored.append([-score, r, c])
+    return [[r, c] for score, r, c in sorted(scored)]
+
+def neighbour_tables(rows, columns):
+    """
+    Precompute the move and neighbourhood tables for a field shape, once per shape.
+    Positions are numbered row by row: index = row * columns + column.
+    :param rows: number of rows
+    :param columns: number of columns
+    :return: (steps, king, adjacent). steps[i] lists the indices of the positions right, down, left and up of position i (-1 when outside of the field),
+             king[i] is a bitmask of position i and its (up to) 8 surrounding positions, adjacent[i] is a bitmask of the positions in steps[i].
+    """
+    if (rows, columns) not in neighbour_tables_cache:
+        steps = []
+        king = []
+        adjacent = []
+        for r in range(rows):
+            for c in range(columns):
+                step = []
+                for rs, cs in [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]]: #same order as new_position(): right, down, left, up
+                    if 0 <= rs < rows and 0 <= cs < columns:
+                        step.append(rs * columns + cs)
+                    else:
+                        step.append(-1)
+                steps.append(tuple(step))
+                adjacent.append(sum(1 << i for i in step if i != -1))
+                mask = 0
+                for rk in range(max(0, r - 1), min(r + 1, rows - 1) + 1):
+                    for ck in range(max(0, c - 1), min(c + 1, columns - 1) + 1):
+                        mask |= 1 << (rk * columns + ck)
+                king.append(mask)
+        neighbour_tables_cache[(rows, columns)] = (tuple(steps), tuple(king), tuple(adjacent))
+    return neighbour_tables_cache[(rows, columns)]
+
+def frontier_search(field_dimensions, pre_set, digits, fixed = {}, limit = 1, stop = None):
+    """
+    Searches all routes at once with a dynamic program over a frontier that sweeps the field column by column (one position at a time), instead of following one route.
+    Only the frontier is remembered: for every row the digit of its last swept position and the step the route has to have at the next position to the right (if it continues there), the same for the step down to the next position, and the digit up-left of the next position.
+    The swept part of the field holds pieces of the route. Each piece covers a range of steps, and its ends on the frontier tell which step the route has to have next, so the steps that are taken follow from the frontier.
+    States with the same frontier are merged, which keeps the number of states small for narrow fields. The field is turned so the frontier runs along the shortest side, and its cost grows with the length of the field instead of exponentially like the searches from one starting position.
+    Counts all solutions, as routes like count_solutions().
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits, see solve()
+    :param digits: digit of pi for every step, see pi_digits()
+    :param fixed: {position index: step} of positions with a fixed step, e.g. {start: 0} for a fixed starting position
+    :param limit: number of solutions to give
+    :param stop: event that stops the search when set, checked every stop_check_interval states and moves (and after every position)
+    :return: (number of solutions, list of at most limit solutions as lists of position indices, number of states), or None if stopped
+    """
+    transposed = field_dimensions[0] > field_dimensions[1]
+    rows, columns = (field_dimensions[1], field_dimensions[0]) if transposed else field_dimensions
+    size = rows * columns
+    position = [] #position index in the field of every swept position (column by column)
+    for c in range(columns):
+        for r in range(rows):
+            position.append(c * rows + r if transposed else r * columns + c)
+    swept = {i: s for s, i in enumerate(position)}
+    clues = [-1] * size #pre-set digit of every swept position
+    for (r, c), digit in ([] if pre_set == [0] else pre_set):
+        clues[swept[r * field_dimensions[1] + c]] = digit
+    fixed_steps = [-1] * size #fixed step of every swept position
+    for i, step in fixed.items():
+        fixed_steps[swept[i]] = step
+    taken = set(fixed.values()) #steps that only the fixed positions may have
+    #a plug is a connection of the route to a position that is not swept yet: 2 * step that position has to have, + 1 when the route runs towards step 0 there
+    none = (-1,) * rows
+    layer = {(none, none, -1, -1): [1, [], 1]} #state: (digits, right plugs, down plug, up-left digit) -> [number of routes, [(previous state, step)], routes through the previous states listed]
+    layers = [layer]
+    states = 0
+    stop_countdown = stop_check_interval
+    for s in range(size):
+        c, r = divmod(s, rows)
+        right = c + 1 < columns
+        down = r + 1 < rows
+        new_layer = {}
+        for key, entry in layer.items():
+            digit_row, plug_row, plug_down, up_left = key
+            plug_left = plug_row[r]
+            moves = [] #(step, plug to the right, plug down) for this position
+            if plug_left != -1 and plug_down != -1: #two pieces of route meet here
+                if plug_left >> 1 == plug_down >> 1 and plug_left & 1 != plug_down & 1:
+                    moves.append((plug_left >> 1, -1, -1))
+            elif plug_left != -1 or plug_down != -1: #a piece of route continues here
+                plug = max(plug_left, plug_down)
+                step = plug >> 1
+                if plug & 1 == 0 and step == size - 1 or plug & 1 and step == 0: #end or start of the route
+                    moves.append((step, -1, -1))
+                else:
+                    plug = (step + 1) << 1 if plug & 1 == 0 else (step - 1) << 1 | 1
+                    if right:
+                        moves.append((step, plug, -1))
+                    if down:
+                        moves.append((step, -1, plug))
+            else: #a new piece of route starts here, at any step that is not taken yet
+                plugs = sorted(x for x in plug_row if x != -1)
+                free = [] #ranges of steps that are not taken yet
+                if plugs:
+                    low = 0
+                    for plug in plugs:
+                        if plug & 1:
+                            free.append((low, plug >> 1))
+                        else:
+                            low = plug >> 1
+                    if plugs[-1] & 1 == 0:
+                        free.append((low, size - 1))
+                    colour = next((i + (c + 1 if i < r else c) + (plug >> 1)) % 2 for i, plug in enumerate(plug_row) if plug != -1) #like on a chess board, every step goes to the other colour
+                elif s == 0:
+                    free.append((0, size - 1))
+                    colour = -1
+                for low, high in free:
+                    for step in range(low, high + 1):
+                        if colour != -1 and (r + c + step) % 2 != colour:
+                            continue
+                        if size == 1:
+                            moves.append((0, -1, -1))
+                        elif step == 0 or step == size - 1: #start or end of the route, with one connection
+                            if step == 0 and high >= 1 or step == size - 1 and low <= size - 2:
+                                plug = 2 if step == 0 else (size - 2) << 1 | 1
+                                if right:
+                                    moves.append((step, plug, -1))
+                                if down:
+                                    moves.append((step, -1, plug))
+                        elif low < step < high and right and down:
+                            moves.append((step, (step + 1) << 1, (step - 1) << 1 | 1))
+                            moves.append((step, (step - 1) << 1 | 1, (step + 1) << 1))
+            if stop is not None: #a state can have hundreds of moves, so count those
+                stop_countdown += -1 - len(moves)
+                if stop_countdown <= 0:
+                    stop_countdown = stop_check_interval
+                    if stop.is_set():
+                        return None
+            for step, new_right, new_down in moves:
+                if fixed_steps[s] != step and (fixed_steps[s] != -1 or step in taken):
+                    continue
+                digit = digits[step]
+                if clues[s] != -1 and clues[s] != digit:
+                    continue
+                if digit == up_left or down and digit == digit_row[r + 1]: #diagonal neighbours can't have the same digit
+                    continue
+                if digit == digit_row[r] and plug_left == -1 or r > 0 and digit == digit_row[r - 1] and plug_down == -1: #neighbours with the same digit have to be consecutive steps
+                    continue
+                new_plugs = plug_row[:r] + (new_right,) + plug_row[r + 1:]
+                ends = [(plug, i, c + 1 if i <= r else c) for i, plug in enumerate(new_plugs) if plug != -1] #plugs with the position they lead to
+                if new_down != -1:
+                    ends.append((new_down, r + 1, c))
+                if not ends and s + 1 < size: #the route is finished before the field is full
+                    continue
+                ends.sort()
+                legal = True
+                for k, (plug, re, ce) in enumerate(ends):
+                    se = ce * rows + re
+                    if clues[se] != -1 and clues[se] != digits[plug >> 1] or fixed_steps[se] != plug >> 1 and (fixed_steps[se] != -1 or plug >> 1 in taken):
+                        legal = False
+                        break
+                    if k > 0:
+                        previous, rp, cp = ends[k - 1]
+                        if plug & 1 == previous & 1: #the pieces of route overlap
+                            legal = False
+                            break
+                        if previous & 1 and (plug >> 1) - (previous >> 1) < 2 or previous & 1 == 0 and (plug >> 1) - (previous >> 1) < abs(re - rp) + abs(ce - cp): #the steps in between can't get from one plug to the other
+                            legal = False
+                            break
+                if not legal:
+                    continue
+                new_key = (digit_row[:r] + (digit,) + digit_row[r + 1:], new_plugs, new_down, digit_row[r] if down else -1)
+                new_entry = new_layer.get(new_key)
+                if new_entry is None:
+                    new_layer[new_key] = [entry[0], [(key, step)], entry[0]]
+                    states += 1
+                else:
+                    new_entry[0] += entry[0]
+                    if new_entry[2] < limit: #keep enough previous states to give limit solutions
+                        new_entry[1].append((key, step))
+                        new_entry[2] += entry[0]
+        layer = new_layer
+        layers.append(layer)
+        if stop is not None and stop.is_set():
+            return None
+    solutions = []
+    steps = [0] * size #step of every swept position in the solution being put together
+    trail = [iter([(key, -1) for key in layer])] #previous states still to go through, from the last layer back to the first
+    while trail and len(solutions) < limit:
+        s = size - len(trail) + 1
+        item = next(trail[-1], None)
+        if item is None:
+            trail.pop()
+            continue
+        key, step = item
+        if step != -1:
+            steps[s] = step
+        if s == 0:
+            route = [0] * size
+            for t in range(size):
+                route[steps[t]] = position[t]
+            solutions.append(route)
+        else:
+            trail.append(iter(layers[s][key][1]))
+    return sum(entry[0] for entry in layer.values()), solutions, states
+
+def engine_check(engine, bugfix_type, field_dimensions = None):
+    """
+    Checks the engine input of solve() and create_puzzle(), and chooses the engine for "auto".
+    :param engine: "auto", "bitboard", "numpy" or "frontier"
+    :param bugfix_type: see solve(). The bugfix output is only printed by the numpy engine.
+    :param field_dimensions: [number of rows, number of columns], for "auto": the frontier engine for long narrow fields (see frontier_width and frontier_ratio), the bitboard engine for other fields
+    :return: the engine to use
+    """
+    if engine not in engines:
+        print("Invalid input for engine. Accepted inputs are 'auto', 'bitboard', 'numpy' or 'frontier'. Program will run with the bitboard engine.")
+        engine = "bitboard"
+    if engine == "auto":
+        engine = "bitboard"
+        if field_dimensions is not None and min(field_dimensions) <= frontier_width and max(field_dimensions) >= frontier_ratio * min(field_dimensions):
+            engine = "frontier"
+    if engine != "numpy" and bugfix_type in [1,2,3]:
+        print("The bugfix output is only available with the numpy engine. Program will run with the numpy engine.")
+        engine = "numpy"
+    return engine
+
+class Deadline:
+    """
+    Stops a search at a given time, to be set as DopingSolver.stop. Like an event, it has is_set(), which is True once the time has passed.
+    As the search checks its stop every stop_check_interval positions, it also stops a search from one starting position that is running when the time is up.
+    """
+    __slots__ = ("time", "stop")
+
+    def __init__(self, time, stop = None):
+        """
+        :param time: time (as given by perf_counter()) at which the search has to stop
+        :param stop: another event that stops the search when set, e.g. to cancel the search before the time is up. Default is none.
+        """
+        self.time = time
+        self.stop = stop
+
+    def is_set(self):
+        return perf_counter() >= self.time or self.stop is not None and self.stop.is_set()
+
+class SearchHooks:
+    """
+    Hooks that are called by the search of a DopingSolver, to follow what the search does without changing it.
+    Set the hooks attribute of a DopingSolver (or the hooks option of solve()) to an instance of a subclass that overrides the methods of interest, e.g. SearchProfile.
+    Every method gets the solver as first argument. Steps are numbered as n (0 for the starting position) and positions as row * columns + column.
+    The numpy and bitboard engines call all methods. The frontier engine only calls on_start() and on_finish(), as it doesn't search move by move.
+    Without hooks (None, the default) the search only checks for them, so they cost nothing when not used.
+    """
+    __slots__ = ()
+
+    def on_start(self, solver, start_position):
+        """
+        Called by start_solver() before searching from a starting position.
+        """
+
+    def on_node(self, solver, step, position):
+        """
+        Called after position is filled in as step.
+        """
+
+    def on_backtrack(self, solver, step, position):
+        """
+        Called after position, filled in as step, is taken back.
+        """
+
+    def on_prune(self, solver, step, reason):
+        """
+        Called when a move from step is not taken: reason "illegal move" when it is against the rules (outside the field, on the route, next to an equal digit or on a pre-set digit that differs),
+        otherwise the pruning reason, see DopingSolver.bitboard_solver().
+        """
+
+    def on_finish(self, solver, start_position, result, time_elapsed):
+        """
+        Called by start_solver() after searching from a starting position.
+        :param result: "solved", "no solution" or "stopped", see start_solver()
+        :param time_elapsed: time in seconds the search from this starting position took
+        """
+
+class SearchProfile(SearchHooks):
+    """
+    Hooks that count what the search does: positions filled in per step, positions taken back per step, moves not taken per reason and the time per starting position.
+    Optionally writes the events as JSON lines to a trace file, one list per event:
+    ["start", [row, column]], ["node", step, position], ["backtrack", step, position], ["prune", step, reason] and ["finish", [row, column], result, seconds].
+    As a search makes millions of events, sample can be set to only write one of every so many node, backtrack and prune events.
+    """
+    __slots__ = ("nodes", "backtracks", "pruned", "starts", "trace", "sample", "countdown")
+
+    def __init__(self, trace = None, sample = 1):
+        """
+        :param trace: file opened for writing to write the events to, None (default) for no trace
+        :param sample: write every sample-th node, backtrack and prune event to the trace. Default is every event. Start and finish events are always written.
+        """
+        self.nodes = [] #number of positions filled in, per step
+        self.backtracks = [] #number of positions taken back, per step
+        self.pruned = {} #number of moves not taken, per reason
+        self.starts = [] #[starting position, result, time in seconds] of every search
+        self.trace = trace
+        self.sample = sample
+        self.countdown = sample #number of events until the next one is written
+
+    def write(self, event):
+        """
+        Write an event to the trace, if any. Node, backtrack and prune events are sampled.
+        """
+        if self.trace is None:
+            return
+        if event[0] in ["node", "backtrack", "prune"]:
+            self.countdown += -1
+            if self.countdown > 0:
+                return
+            self.countdown = self.sample
+        self.trace.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def on_start(self, solver, start_position):
+        size = solver.field_dimensions[0] * solver.field_dimensions[1]
+        if len(self.nodes) < size:
+            self.nodes += [0] * (size - len(self.nodes))
+            self.backtracks += [0] * (size - len(self.backtracks))
+        self.write(["start", list(start_position)])
+
+    def on_node(self, solver, step, position):
+        self.nodes[step] += 1
+        self.write(["node", step, position])
+
+    def on_backtrack(self, solver, step, position):
+        self.backtracks[step] += 1
+        self.write(["backtrack", step, position])
+
+    def on_prune(self, solver, step, reason):
+        self.pruned[reason] = self.pruned.get(reason, 0) + 1
+        self.write(["prune", step, reason])
+
+    def on_finish(self, solver, start_position, result, time_elapsed):
+        self.starts.append([list(start_position), result, time_elapsed])
+        self.write(["finish", list(start_position), result, time_elapsed])
+
+    def report(self):
+        """
+        :return: dictionary with the counts: positions filled in and taken back per step (without the steps that weren't reached), moves not taken per reason and the searches per starting position
+        """
+        reached = max([step + 1 for step in range(len(self.nodes)) if self.nodes[step] or self.backtracks[step]], default=0)
+        return {"nodes": self.nodes[: reached], "backtracks": self.backtracks[: reached], "pruned": dict(self.pruned), "starts": [list(start) for start in self.starts]}
+
+class BugfixPrinter(SearchHooks):
+    """
+    Hooks that print the moves and/or the field after every move that is not taken, for the bugfix_type option of solve().
+    Only useful with the numpy engine, as the other engines don't fill in the field while searching.
+    """
+    __slots__ = ("bugfix_type",)
+
+    def __init__(self, bugfix_type):
+        """
+        :param bugfix_type: 1 for both field and moves; 2 for moves only; 3 for field only
+        """
+        self.bugfix_type = bugfix_type
+
+    def on_prune(self, solver, step, reason):
+        if self.bugfix_type in [1, 2]:
+            print("moves:", solver.moves)
+        if self.bugfix_type in [1, 3]:
+            print(solver.field)
+
+class MoveStack:
+    """
+    Keeps track of the route and the tried options from every position, one entry per step n.
+    Stored in flat arrays instead of a list of [position, count, order, digit] lists. A step is only added by push(), so every new position gets one random order.
+    """
+    __slots__ = ("columns", "position", "count", "order", "digit")
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.position = array("i") #position index (row * columns + column)
+        self.count = array("b") #number of options tried from the position
+        self.order = array("b") #4 items per step: order in which right, down, left and up are tried
+        self.digit = array("b") #digit of pi at the position
+
+    def __len__(self):
+        return len(self.position)
+
+    def __repr__(self):
+        return repr(self.entries())
+
+    def push(self, position, order, digit):
+        """
+        Add a new step with no options tried yet.
+        """
+        self.position.append(position)
+        self.count.append(0)
+        self.order.extend(order)
+        self.digit.append(digit)
+
+    def pop(self):
+        """
+        Remove the last step.
+        """
+        self.position.pop()
+        self.count.pop()
+        del self.order[-4:]
+        self.digit.pop()
+
+    def clear(self):
+        """
+        Remove all steps.
+        """
+        del self.position[:]
+        del self.count[:]
+        del self.order[:]
+        del self.digit[:]
+
+    def coordinates(self, n):
+        """
+        :return: [row, column] of step n
+        """
+        return [self.position[n] // self.columns, self.position[n] % self.columns]
+
+    def path(self):
+        """
+        :return: the route taken as a tuple of [row, column] items
+        """
+        return tuple(self.coordinates(n) for n in range(len(self.position)))
+
+    def entries(self):
+        """
+        :return: the moves in the list format of earlier versions: [[position, count, order, digit], ...]
+        """
+        return [[self.coordinates(n), self.count[n], list(self.order[4 * n: 4 * n + 4]), self.digit[n]] for n in range(len(self.position))]
+
+class DopingSolver:
+    """
+    Holds the search state of one DoPing puzzle: the fields, the moves taken and the progress n.
+    Every puzzle gets its own DopingSolver, so several puzzles can be solved at the same time (e.g. in a thread pool).
+    solve() and create_puzzle() create one for every call.
+    """
+    __slots__ = ("field_dimensions", "pre_set", "digits", "field", "unsolved_field", "display_field", "coordinates", "moves", "n", "floor", "failed_sp", "rng", "stop",
+                 "prune", "ordering", "nodes", "tried", "backtracks", "pruned", "limit", "found", "solutions", "memo", "hooks", "node_budget")
+
+    def __init__(self, field_dimensions, pre_set = [0], rng = None):
+        """
+        :param field_dimensions: [number of rows, number of columns]
+        :param pre_set: pre-set digits, see solve()
+        :param rng: random.Random instance for the random choices. Default is the random module itself, so random.seed() applies.
+        The search can be stopped from outside by setting stop to an event (anything with is_set()) and setting that event, or at a given time with a Deadline.
+        It also stops when node_budget is set and the number of positions filled in reaches it.
+        prune and ordering set the pruning and move order of bitboard_solver().
+        hooks can be set to a SearchHooks instance to follow the search, see SearchHooks.
+        """
+        self.field_dimensions = field_dimensions
+        self.pre_set = pre_set
+        self.digits = array("b") #digits of pi for the steps of the route, see pi_digits()
+        self.field = []
+        self.unsolved_field = [] #unsolved field with only the pre-set digits
+        self.display_field = [] #field with string items instead of integers
+        self.coordinates = [] #locations with pre-set digits
+        self.moves = MoveStack(field_dimensions[1]) #keeps track of route and tried options from that position
+        self.n = 0 #current progress quantifier
+        self.floor = 0 #step that the search may not go back beyond (0, or the end of a fixed route given to start_solver())
+        self.failed_sp = 0 #counter for unsuccesful starting positions
+        self.rng = random if rng is None else rng
+        self.stop = None #event that stops the search when set
+        self.prune = True #skip moves after which the route can't be finished (bitboard engine only)
+        self.ordering = "random" #order of trying moves: "random" or "warnsdorff" (bitboard engine only)
+        self.nodes = 0 #number of positions filled in, over all searches of this solver
+        self.tried = 0 #number of moves tried
+        self.backtracks = 0 #number of positions taken back
+        self.pruned = {"dead end": 0, "split": 0, "pre-set digit": 0, "known state": 0} #number of moves skipped by pruning, per reason
+        self.limit = 1 #number of solutions bitboard_solver() looks for before it stops, more than 1 when counting solutions
+        self.found = 0 #number of solutions counted, see count_solutions()
+        self.solutions = [] #solutions counted, as lists of position indices (row * columns + column)
+        self.memo = None #number of solutions (and one of them) after search states that were searched completely, None to not remember them. Only set by count_solutions() (see bitboard_solver())
+        self.hooks = None #SearchHooks that follow the search, None for none
+        self.node_budget = None #maximum number of positions filled in (self.nodes) before the search stops, None for no maximum. Not used by the frontier engine.
+
+    def create_field(self):
+        """
+        Create the field, display_field and unsolved_field with, if applicable, the pre_set digits set
+        :return: "fields made" when succesful, "impossible" when pre-set positions are out of bounds
+        """
+        field_dimensions = self.field_dimensions
+        pre_set = self.pre_set
+        self.field = -1 * np.ones((field_dimensions[0], field_dimensions[1]), dtype=int) #create field
+        self.digits = pi_digits(self.field.size)
+        self.display_field = np.full((field_dimensions[0], field_dimensions[1]), '_', str) #create display field
+        if pre_set == [0]: #no pre-set
+            self.unsolved_field = self.field.copy() #store the unsolved field
+        else:
+            self.coordinates = [x[0] for x in pre_set] #split preset lists for coordinates and digits
+            digits = [x[1] for x in pre_set]
+            j = 0
+            while j < len(digits): #if the preset digits are not in the possible digits for this size of field, let solve() know it's impossible to solve.
+                if digits[j] not in self.digits:
+                    return "impossible"
+                j += 1
+            i = 0
+            while i < len(pre_set): #put the pre-set digits in the field and display field
+                self.field[self.coordinates[i][0], self.coordinates[i][1]] = digits[i]
+                self.display_field[self.coordinates[i][0], self.coordinates[i][1]] = digits[i]
+                i += 1
+            self.unsolved_field = self.field.copy() #store the unsolved field
+        return "fields made"
+
+    def reset_field(self):
+        """
+        Reset the field to the unsolved field after an unsuccesful starting position.
+        """
+        self.field[:] = self.unsolved_field
+        self.moves.clear()
+        self.n = 0
+
+    def new_position(self, count):
+        """
+        Create the coordinates of new positions to check for validity.
+        Follows the standard order right -> down -> left -> up
+        Input moves.count[n] to know which option needs to be checked.
+        :return: proposed position in [r,c] or False if all possible positions have been tried without succes.
+        """
+        r, c = self.moves.coordinates(self.n)
+        order = [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]]  # move options [right, down, left, up]
+        if count >= 4:
+            return False
+        return order[self.moves.order[4 * self.n + count]]
+
+    def legal_position(self, proposed_position):
+        """
+        Checking mechanism for legality of new position.
+        Checking for (in order):
+        - if position is within the field;
+        - if position is not already taken;
+        - if the input value won't be the same as that of any of the directly surrounding 8 fields (except for the preceeding position, or a pre-set position right next to it that will be the next position).
+        If legal, the function returns True
+        If not legal, function returns False
+        """
+        if proposed_position == False:
+            return False
+        field = self.field
         r = proposed_position[0]
         c = proposed_position[1]
-        try: # test whether position is in the field. If not, except will return False
-            if r < 0 or c < 0: #check if the position is not already taken by another digit and that the row or column isn't negative (would mean the solver would jump across the field)
-                return False
-            if field[r,c] != -1:
-                return match_init_digits(r,c)
-        except:
+        if r < 0 or c < 0 or r >= field.shape[0] or c >= field.shape[1]: #the position must be in the field (a negative row or column would make the solver jump across the field)
+            return False
+        if field[r,c] != -1 and self.match_init_digits(r,c) == False: #check if the position is not already taken by another digit
             return False
         #checking mechanism value
-        next_number = int(pi[n+1])
+        next_number = self.digits[self.n+1]
         #nb = neighbouring fields including field being checked
         nb = field[ max(0,r-1) : min(r+1,field.shape[0]-1)+1, max(0,c-1) : min(c+1,field.shape[1]-1)+1 ] #from one row above to one row below the column on the left to the column on the right, excluding any positions outside of the matrix
-        if np.count_nonzero(nb == next_number) == 0 or np.count_nonzero(nb == next_number) == 1 and next_number == int(pi[n]): #if digit not present in surrounding positions, or if it's the preceeding digit, the position is valid.
+        if np.count_nonzero(nb == next_number) == 0: #if digit not present in surrounding positions, the position is valid.
             return True
-        else: #if digit present in surrounding positions once and the preceeding digit is not the same, or if present more than once in surrounding fields, the position is invalid.
+        on_route = 0 #surrounding positions on the route with the same digit
+        pre_set = [] #surrounding pre-set positions, not on the route yet, with the same digit
+        for rn in range(max(0,r-1), min(r+1,field.shape[0]-1)+1):
+            for cn in range(max(0,c-1), min(c+1,field.shape[1]-1)+1):
+                if field[rn,cn] != next_number or [rn,cn] == [r,c]:
+                    continue
+                if rn * field.shape[1] + cn in self.moves.position:
+                    on_route += 1
+                else:
+                    pre_set.append([rn,cn])
+        if on_route > 1 or on_route == 1 and next_number != self.digits[self.n]: #only allowed once and when it's the preceeding digit
             return False
+        if len(pre_set) > 1 or len(pre_set) == 1 and (self.n+2 >= field.size or next_number != self.digits[self.n+2] or abs(pre_set[0][0]-r) + abs(pre_set[0][1]-c) != 1): #only allowed once and when it's the next digit, right next to it
+            return False
+        return True
 
-def match_init_digits(r,c):
+    def match_init_digits(self, r, c):
+        """
+        Checks when encountering a filled position whether this is a previously solved positition, or an pre-set position.
+        :param r: row
+        :param c: column
+        :return: True if pre-set digit, False if previously solved position
+        """
+        if r * self.field.shape[1] + c in self.moves.position: #previously solved position
+            return False
+        return self.field[r,c] == self.digits[self.n+1] #pre-filled position, True if it has the correct digit
+
+    def move_order(self):
+        """
+        Draws the random order in which the moves from a new position are tried, as one of move_orders.
+        One random number per position instead of self.rng.sample(), which took more time than the rest of a step. All engines draw their orders this way, so they stay the same for the same random seed.
+        :return: tuple of the directions (0=right, 1=down, 2=left, 3=up) in the order they are tried
+        """
+        return move_orders[int(self.rng.random() * 24)]
+
+    def interrupted(self, nodes = 0):
+        """
+        Checks whether the search has to stop, as self.stop is set or self.node_budget is used up. The engines check this every stop_check_interval positions.
+        :param nodes: positions filled in by the running search that are not counted in self.nodes yet
+        :return: True if the search has to stop
+        """
+        return self.stop is not None and self.stop.is_set() or self.node_budget is not None and self.nodes + nodes >= self.node_budget
+
+    def remove(self):
+        """"
+        remove the positions and numbers if it leads to a dead end. Go back as far as needed.
+        """
+        moves = self.moves
+        if moves.count[self.n] >= 4:
+            if self.n == self.floor: #when the starting position (or fixed route) yields no solutions
+                return False
+            else:
+                r, c = moves.coordinates(self.n)
+                if [r, c] not in self.coordinates:
+                    self.field[r, c] = -1
+                moves.pop()
+                self.n += -1
+                self.backtracks += 1
+                if self.hooks is not None:
+                    self.hooks.on_backtrack(self, self.n + 1, r * self.field.shape[1] + c)
+                moves.count[self.n] += 1
+                if moves.count[self.n] == 4:
+                    self.remove() #call remove() again if all options have already been tried for the new current position (prevents the count succeeding 4)
+
+    def solver(self):
+        """
+        Solves the puzzle. For bugfixing options, see BugfixPrinter.
+        Prints the solution + taken route in coordinates and directions (0=right, 1=down, 2=left, 3=up)
+        :return: True if solved, False if there is no solution, None if stopped through self.stop or self.node_budget
+        """
+        moves = self.moves
+        columns = self.field.shape[1]
+        checking = self.stop is not None or self.node_budget is not None
+        stop_countdown = stop_check_interval
+        hooks = self.hooks
+        while self.n+1 != self.field.size: #contintue as long as there are no 'empty' fields and all fields have been 'visited'
+            while self.legal_position(self.new_position(moves.count[self.n])) != True:
+                moves.count[self.n] += 1 #log that a new move has been tried
+                self.tried += 1
+                if hooks is not None:
+                    hooks.on_prune(self, self.n, "illegal move")
+                if self.remove() == False: #check if removal is needed and remove log items if needed
+                    return False
+            r, c = self.new_position(moves.count[self.n]) #make position the proposed position
+            self.tried += 1
+            self.nodes += 1
+            self.n += 1 #keep track of progress
+            self.field[r, c] = self.digits[self.n] #change field value to the corresponding digit of pi
+            moves.push(r * columns + c, self.move_order(), self.digits[self.n]) #one draw per new position, like bitboard_solver() (the list of moves of earlier versions drew twice when the step was new)
+            if hooks is not None:
+                hooks.on_node(self, self.n, r * columns + c)
+            if checking:
+                stop_countdown += -1
+                if stop_countdown == 0:
+                    stop_countdown = stop_check_interval
+                    if self.interrupted():
+                        return None
+        return True
+
+    def bitboard_solver(self):
+        """
+        Solves the puzzle like solver(), but with bit operations on precomputed tables instead of numpy slices of the field.
+        Keeps one occupancy bitmask per digit, so checking a move is a few bit operations without creating any arrays.
+        Continues from the moves as set by start_solver() and tries the moves in the same random order as solver(), so for the same random seed both engines find the same solution (with prune off).
+        With self.prune, moves after which the route can't be finished are skipped without searching them:
+        - "dead end": more than one empty position can only be reached from one side, while a route can only end in one of them;
+        - "split": the empty positions are split into parts that can't all be reached;
+        - "pre-set digit": a pre-set digit is further away than the last step it can still be at (see pre_set_steps()).
+        Only moves without solutions are skipped, but as the skipped positions don't get a random order, the solution found for a random seed can differ from solver()'s.
+        With self.ordering "warnsdorff", the moves to positions with the fewest empty neighbours are tried first (random order when equal).
+        When solved, field, moves and n are filled in the same way solver() would.
+        With self.limit above 1 the search counts solutions instead (see count_solutions()): it goes back after every solution and stops when self.found reaches self.limit.
+        When counting and self.memo is a dictionary (as set by count_solutions()), search states that were searched completely are stored in it with their number of solutions, so when another route ends up in the same state it is not searched again ("known state").
+        States are not remembered when looking for one solution.
+        A state is the last position, the positions on the route and the digits on the route next to the empty positions, as nothing else decides how the route can continue.
+        The number of states grows with the number of ways the route can cross the field, which stays small for narrow fields (see solve(), engine "frontier").
+        :return: True if solved (or self.limit solutions were counted), False if the starting position (or fixed route) yields no (more) solutions, None if stopped through self.stop or self.node_budget
+        """
+        rows, columns = self.field.shape
+        size = self.field.size
+        steps, king, adjacent = neighbour_tables(rows, columns)
+        digits = self.digits.tolist() + [-1] #-1 as the digit after the last step
+        occupied = [0] * 10 #bitmask of the positions on the route for each digit
+        pre_set = [0] * 10 #bitmask of the pre-set positions for each digit
+        pre_set_digits = [-1] * size #pre-set digit for each position, -1 if not pre-set
+        for r, c in zip(*np.nonzero(self.unsolved_field != -1)):
+            pre_set_digits[r * columns + c] = int(self.unsolved_field[r, c])
+            pre_set[self.unsolved_field[r, c]] |= 1 << (r * columns + c)
+        moves = self.moves
+        path = moves.position
+        counts = moves.count
+        orders = moves.order
+        visited = 0
+        for k in range(len(moves)): #the starting position and the fixed route, if any
+            visited |= 1 << path[k]
+            occupied[digits[k]] |= 1 << path[k]
+        full = (1 << size) - 1
+        first_column = sum(1 << (r * columns) for r in range(rows))
+        not_first = full ^ first_column #positions that are not in the first column
+        not_last = full ^ (first_column << (columns - 1)) #positions that are not in the last column
+        prune = self.prune
+        warnsdorff = self.ordering == "warnsdorff"
+        draw = self.rng.random #see move_order()
+        checking = self.stop is not None or self.node_budget is not None
+        stop_countdown = stop_check_interval
+        floor = self.floor
+        step_n = len(moves) - 1
+        limit = self.limit
+        counting = limit > 1
+        found = self.found
+        solutions = self.solutions
+        memo = self.memo
+        memoise = counting and memo is not None
+        hooks = self.hooks
+        keys = [None] * size #search state after each step, when remembering states
+        found_before = [0] * size #solutions counted before each step was taken
+        solutions_before = [0] * size #solutions stored before each step was taken
+        nodes = tried = backtracks = dead_ends = splits = far_pre_sets = known_states = 0
+        result = True
+        last_steps = [] #[position, row, column, last step] of every pre-set digit that is not on the route yet
+        if prune:
+            for (r, c), possible in pre_set_steps(self.field_dimensions, self.pre_set, self.moves.coordinates(0)).items():
+                if visited >> (r * columns + c) & 1 == 0:
+                    last_steps.append([r * columns + c, r, c, max(possible, default=-1)])
+                    if possible == []:
+                        far_pre_sets += 1
+                        result = False
+                        if hooks is not None:
+                            hooks.on_prune(self, step_n, "pre-set digit")
+        if prune and result and visited != full: #check the route so far, as the checks below only look at the effect of the last move
+            reach = adjacent[path[step_n]] & ~visited
+            while True:
+                grown = reach | ((reach << 1) & not_first | (reach >> 1) & not_last | reach << columns | reach >> columns) & ~visited & full
+                if grown == reach:
+                    break
+                reach = grown
+            if reach != full ^ visited:
+                splits += 1
+                result = False
+                if hooks is not None:
+                    hooks.on_prune(self, step_n, "split")
+        while result:
+            if step_n + 1 == size: #route through all positions
+                if not counting:
+                    break
+                found += 1
+                if len(solutions) < limit:
+                    solutions.append(list(path))
+                if found >= limit:
+                    break
+                counts[step_n] = 4 #go back to look for other solutions
+            count = counts[step_n]
+            if count == 4: #all moves tried, go back one step
+                if step_n == floor: #when the starting position (or fixed route) yields no solutions
+                    result = False
+                    break
+                if memoise: #every route from this state has been searched
+                    suffix = None #the rest of the route of one of the solutions
+                    if found > found_before[step_n] and solutions_before[step_n] < len(solutions):
+                        suffix = solutions[solutions_before[step_n]][step_n:]
+                    memo[keys[step_n]] = (found - found_before[step_n], suffix)
+                i = path[step_n]
+                moves.pop()
+                visited ^= 1 << i
+                occupied[digits[step_n]] ^= 1 << i
+                step_n += -1
+                counts[step_n] += 1
+                backtracks += 1
+                if hooks is not None:
+                    hooks.on_backtrack(self, step_n + 1, i)
+                continue
+            tried += 1
+            i = steps[path[step_n]][orders[4 * step_n + count]]
+            if i == -1 or visited >> i & 1: #outside of the field or already part of the path
+                counts[step_n] = count + 1
+                if hooks is not None:
+                    hooks.on_prune(self, step_n, "illegal move")
+                continue
+            next_number = digits[step_n + 1]
+            if pre_set_digits[i] != -1 and pre_set_digits[i] != next_number: #pre-filled position with another digit
+                counts[step_n] = count + 1
+                if hooks is not None:
+                    hooks.on_prune(self, step_n, "illegal move")
+                continue
+            nb = occupied[next_number] & king[i] #surrounding positions on the route with the same digit
+            if nb != 0 and (next_number != digits[step_n] or nb & (nb - 1) != 0): #only allowed once and when it's the preceeding digit
+                counts[step_n] = count + 1
+                if hooks is not None:
+                    hooks.on_prune(self, step_n, "illegal move")
+                continue
+            nb = pre_set[next_number] & king[i] & ~visited & ~(1 << i) #surrounding pre-set positions (not on the route yet) with the same digit
+            if nb != 0 and (next_number != digits[step_n + 2] or nb & (nb - 1) != 0 or nb & adjacent[i] == 0): #only allowed once and when it's the next digit, right next to it
+                counts[step_n] = count + 1
+                if hooks is not None:
+                    hooks.on_prune(self, step_n, "illegal move")
+                continue
+            empty = full ^ visited ^ (1 << i) #empty positions after this move
+            if last_steps:
+                r = i // columns
+                c = i % columns
+                too_far = False
+                for x, rp, cp, last in last_steps:
+                    if empty >> x & 1 and step_n + 1 + abs(rp - r) + abs(cp - c) > last: #can't reach the pre-set digit in time anymore
+                        too_far = True
+                        break
+                if too_far:
+                    far_pre_sets += 1
+                    counts[step_n] = count + 1
+                    if hooks is not None:
+                        hooks.on_prune(self, step_n, "pre-set digit")
+                    continue
+            if prune and empty != 0:
+                taken = empty | 1 << i #empty positions and the new position, from which the route continues
+                right = empty & (taken >> 1) & not_last #empty positions with a neighbour in taken on the right
+                left = empty & (taken << 1) & not_first
+                down = empty & (taken >> columns)
+                up = empty & (taken << columns)
+                ends = empty & ~(right & left | up & down | (right | left) & (up | down)) #empty positions with fewer than 2 neighbours in taken
+                if ends & (ends - 1) != 0:
+                    dead_ends += 1
+                    counts[step_n] = count + 1
+                    if hooks is not None:
+                        hooks.on_prune(self, step_n, "dead end")
+                    continue
+                reach = adjacent[i] & empty
+                if reach & (reach - 1) != 0 or reach == 0: #the empty positions were connected, with one empty neighbour they still are
+                    while True:
+                        grown = reach | ((reach << 1) & not_first | (reach >> 1) & not_last | reach << columns | reach >> columns) & empty
+                        if grown == reach:
+                            break
+                        reach = grown
+                    if reach != empty:
+                        splits += 1
+                        counts[step_n] = count + 1
+                        if hooks is not None:
+                            hooks.on_prune(self, step_n, "split")
+                        continue
+            occupied[next_number] |= 1 << i
+            visited |= 1 << i
+            if memoise:
+                near = empty | (empty << 1) & not_first | (empty >> 1) & not_last
+                near = (near | near << columns | near >> columns) & visited #positions on the route next to an empty position
+                key = (i, visited, tuple(digit_positions & near for digit_positions in occupied))
+                known = memo.get(key)
+                if known is not None: #same state as after another route, which has been searched already
+                    solutions_known, suffix = known
+                    known_states += 1
+                    found += solutions_known
+                    if suffix is not None and len(solutions) < limit:
+                        solutions.append(list(path) + suffix)
+                    occupied[next_number] ^= 1 << i
+                    visited ^= 1 << i
+                    counts[step_n] = count + 1
+                    if hooks is not None:
+                        hooks.on_prune(self, step_n, "known state")
+                    if found >= limit:
+                        break
+                    continue
+                keys[step_n + 1] = key
+                found_before[step_n + 1] = found
+                solutions_before[step_n + 1] = len(solutions)
+            step_n += 1
+            nodes += 1
+            order = move_orders[int(draw() * 24)]
+            if warnsdorff:
+                onward = [] #number of empty neighbours of each proposed position
+                for direction in order:
+                    j = steps[i][direction]
+                    if j == -1 or visited >> j & 1:
+                        onward.append(5)
+                    else:
+                        onward.append(bin(adjacent[j] & ~visited).count("1"))
+                order = [order[k] for k in sorted(range(4), key=onward.__getitem__)]
+            moves.push(i, order, next_number)
+            if hooks is not None:
+                hooks.on_node(self, step_n, i)
+            if checking:
+                stop_countdown += -1
+                if stop_countdown == 0:
+                    stop_countdown = stop_check_interval
+                    if self.interrupted(nodes):
+                        result = None
+        self.nodes += nodes
+        self.tried += tried
+        self.backtracks += backtracks
+        self.pruned["dead end"] += dead_ends
+        self.pruned["split"] += splits
+        self.pruned["pre-set digit"] += far_pre_sets
+        self.pruned["known state"] += known_states
+        self.found = found
+        if result == True and not counting:
+            for k in range(size):
+                self.field[path[k] // columns, path[k] % columns] = digits[k]
+            self.n = step_n
+        return result
+
+    def start_solver(self, start_position, bugfix_type = 0, engine = "bitboard", route = []):
+        """
+        Puts the initial starting position in the field and calls solver(), bitboard_solver() or frontier_solver(). Also checks for validity of bugfix_type input.
+        :param start_position: position of n(0) digit of pi (so 3)
+        :param bugfix_type: see solve(). If create_puzzle was called, this function is disabled (input 0). Prints through BugfixPrinter, which takes the place of self.hooks for this search.
+        :param engine: "numpy" for solver(), "bitboard" for bitboard_solver(), "frontier" for frontier_solver()
+        :param route: fixed (legal) route of [row, column] positions taken after the starting position, as made by routes(). Only the solutions continuing this route are searched.
+        :return: "solved", "no solution" or "stopped" (when self.stop was set or self.node_budget was used up)
+        """
+        r = start_position[0]
+        c = start_position[1]
+        columns = self.field.shape[1]
+        self.moves.clear()
+        self.n = 0
+        self.floor = len(route)
+        if self.unsolved_field[r, c] not in [-1, 3]: #pre-filled position with another digit than the 3
+            self.failed_sp += 1
+            return "no solution"
+        self.field[r, c] = 3
+        self.moves.push(r * columns + c, self.move_order(), 3)
+        for rr, cr in route: #put the fixed route in the field, with the count of every step at the move that was taken
+            step = [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]].index([rr, cr])
+            self.moves.count[self.n] = self.moves.order[4 * self.n: 4 * self.n + 4].index(step)
+            self.n += 1
+            self.field[rr, cr] = self.digits[self.n]
+            self.moves.push(rr * columns + cr, self.move_order(), self.digits[self.n])
+            r, c = rr, cr
+        if bugfix_type not in [0,1,2,3]:
+            print("Invalid input for bugfix type. Accepted inputs are 0, 1, 2, or 3. Program will run with bugfix disabled (input 0).")
+        hooks = self.hooks
+        if bugfix_type in [1,2,3]:
+            self.hooks = BugfixPrinter(bugfix_type)
+        if self.hooks is not None:
+            self.hooks.on_start(self, start_position)
+            t_start = perf_counter()
+        if engine == "bitboard":
+            solved = self.bitboard_solver()
+        elif engine == "frontier":
+            solved = self.frontier_solver({self.moves.position[k]: k for k in range(len(self.moves))})
+        else:
+            solved = self.solver()
+        if solved == True:
+            result = "solved"
+        elif solved is None:
+            result = "stopped"
+        else:
+            self.failed_sp += 1
+            result = "no solution"
+        if self.hooks is not None:
+            self.hooks.on_finish(self, start_position, result, perf_counter() - t_start)
+        self.hooks = hooks
+        return result
+
+    def search_all(self, engine = "bitboard"):
+        """
+        Searches every starting position until solved: all at once with frontier_solver() for the frontier engine, otherwise the positions of start_positions() one after the other with start_solver().
+        The field is reset after every starting position without a solution, and filled in when solved.
+        :param engine: "numpy", "bitboard" (default) or "frontier", see start_solver()
+        :return: "solved", "no solution" (sure: no starting position has a solution) or "stopped" (when self.stop was set or self.node_budget was used up)
+        """
+        if engine == "frontier":
+            return {True: "solved", False: "no solution", None: "stopped"}[self.frontier_solver()]
+        result = "no solution"
+        for start in start_positions(self.field_dimensions, self.pre_set):
+            result = self.start_solver(start, 0, engine)
+            if result != "no solution":
+                break
+            self.reset_field()
+        return result
+
+    def frontier_solver(self, fixed = {}):
+        """
+        Solves the puzzle with frontier_search(), which searches all starting positions at once.
+        When solved, field, moves and n are filled in the same way solver() would.
+        :param fixed: {position index: step} of positions with a fixed step, e.g. the starting position (and fixed route) put in moves by start_solver(). Default is any starting position.
+        :return: True if solved, False if there is no solution, None if stopped through self.stop
+        """
+        found = frontier_search(self.field_dimensions, self.pre_set, self.digits, fixed, 1, self.stop)
+        if found is None:
+            return None
+        number_of_solutions, solutions, states = found
+        self.nodes += states
+        if number_of_solutions == 0:
+            return False
+        columns = self.field.shape[1]
+        self.moves.clear()
+        for step, i in enumerate(solutions[0]):
+            self.field[i // columns, i % columns] = self.digits[step]
+            self.moves.push(i, list(range(4)), self.digits[step])
+        self.n = len(solutions[0]) - 1
+        return True
+
+    def count_solutions(self, limit = 2, engine = "auto"):
+        """
+        Counts the solutions of the puzzle from all starting positions, until limit solutions are found.
+        With the default limit of 2 this tells whether the puzzle has no solution, exactly one or more than one, without searching for all of them.
+        Solutions are counted as routes, so a turned copy of a solution counts as another solution.
+        The bitboard engine remembers the search states that were searched completely over all starting positions (see bitboard_solver()).
+        The frontier engine always counts all solutions (see frontier_search()), which is faster for long narrow fields.
+        Uses and then resets the field.
+        :param limit: number of solutions after which the counting stops
+        :param engine: "auto" (default), "bitboard" or "frontier", see engine_check()
+        :return: number of solutions, at most limit, or None if stopped through self.stop. The solutions themselves are in self.solutions as lists of position indices (at most limit, but after a remembered state only one of its solutions is stored).
+        """
+        self.found = 0
+        self.solutions = []
+        if engine_check(engine, 0, self.field_dimensions) == "frontier":
+            found = frontier_search(self.field_dimensions, self.pre_set, self.digits, {}, limit, self.stop)
+            if found is None:
+                return None
+            number_of_solutions, self.solutions, states = found
+            self.nodes += states
+            self.found = min(number_of_solutions, limit)
+            return self.found
+        self.limit = limit
+        self.memo = {}
+        stopped = False
+        for start in start_positions(self.field_dimensions, self.pre_set, symmetry=False):
+            stopped = self.start_solver(start, 0, "bitboard") == "stopped"
+            self.reset_field()
+            if stopped or self.found >= limit:
+                break
+        self.limit = 1
+        self.memo = None
+        if stopped:
+            return None
+        return self.found
+
+    def routes(self, start_position, length):
+        """
+        Lists all legal routes of a number of moves from a starting position, to split the search into parts (e.g. for parallel searching).
+        Uses and then resets the field.
+        :param start_position: position of n(0) digit of pi (so 3)
+        :param length: number of moves in each route
+        :return: list of routes, each a list of [row, column] positions after the starting position. Routes that get stuck before reaching the length are left out.
+        """
+        r, c = start_position
+        columns = self.field.shape[1]
+        self.reset_field()
+        found = []
+        if self.unsolved_field[r, c] not in [-1, 3]:
+            return found
+        self.field[r, c] = 3
+        self.moves.push(r * columns + c, list(range(4)), 3)
+        route = []
+        def extend():
+            if len(route) == length:
+                found.append(list(route))
+                return
+            r, c = self.moves.coordinates(self.n)
+            for proposed_position in [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]]:
+                if self.legal_position(proposed_position) == True:
+                    self.n += 1
+                    self.field[proposed_position[0], proposed_position[1]] = self.digits[self.n]
+                    self.moves.push(proposed_position[0] * columns + proposed_position[1], list(range(4)), self.digits[self.n])
+                    route.append(proposed_position)
+                    extend()
+                    route.pop()
+                    self.moves.pop()
+                    self.n += -1
+                    self.field[proposed_position[0], proposed_position[1]] = self.unsolved_field[proposed_position[0], proposed_position[1]]
+        extend()
+        self.reset_field()
+        return found
+
+    def filled_routes(self, entered):
+        """
+        Finds the routes filled in so far when the digits filled in (e.g. by a user solving the puzzle) are given as pre-set digits.
+        A filled in 3 is not always the start of the route, as pi has more 3s, so the longest legal route from every filled in 3 is given, to be tried one by one.
+        Only the positions in entered are used, so the routes don't start from or go through the pre-set digits of the puzzle itself.
+        Uses and then resets the field.
+        :param entered: position indices (row * columns + column) of the digits filled in by the user
+        :return: list of routes, the longest first, each a list of [row, column] positions starting with a 3. Empty if no 3 is filled in.
+        """
+        columns = self.field.shape[1]
+        routes = []
+        route = []
+        def extend(best):
+            if len(route) > len(best):
+                best[:] = route
+            if self.n + 1 == self.field.size:
+                return
+            r, c = route[-1]
+            for proposed_position in [[r, c + 1], [r + 1, c], [r, c - 1], [r - 1, c]]:
+                if self.legal_position(proposed_position) == True and proposed_position[0] * columns + proposed_position[1] in entered:
+                    self.n += 1
+                    self.moves.push(proposed_position[0] * columns + proposed_position[1], list(range(4)), self.digits[self.n])
+                    route.append(proposed_position)
+                    extend(best)
+                    route.pop()
+                    self.moves.pop()
+                    self.n += -1
+        for r, c in zip(*np.nonzero(self.unsolved_field == 3)):
+            if int(r) * columns + int(c) not in entered:
+                continue
+            self.reset_field()
+            self.moves.push(int(r) * columns + int(c), list(range(4)), 3)
+            route.append([int(r), int(c)])
+            best = []
+            extend(best)
+            routes.append(best)
+            route.pop()
+        self.reset_field()
+        return sorted(routes, key=len, reverse=True)
+
+    def statistics(self):
+        """
+        :return: dictionary with the search statistics of this solver: positions filled in ("nodes"), moves tried, positions taken back and moves skipped by pruning per reason
+        """
+        return {"nodes": self.nodes, "tried": self.tried, "backtracks": self.backtracks, "pruned": dict(self.pruned)}
+
+    def print_statistics(self, time_elapsed):
+        """
+        Print the search statistics of this solver.
+        :param time_elapsed: time in seconds the search took
+        """
+        print(f"\n{self.nodes} positions were filled in ({self.nodes / max(time_elapsed, 1e-9):.0f} per second), {self.tried} moves were tried and {self.backtracks} positions were taken back.")
+        print(f"Pruning skipped {self.pruned['dead end']} moves leading to more than one dead end, {self.pruned['split']} moves splitting the empty positions, {self.pruned['pre-set digit']} moves after which a pre-set digit can't be reached in time and {self.pruned['known state']} moves to a state that was searched before.")
+
+    def add_statistics(self, statistics):
+        """
+        Add the statistics of another solver (e.g. from a process of the pool) to the statistics of this one.
+        """
+        self.nodes += statistics["nodes"]
+        self.tried += statistics["tried"]
+        self.backtracks += statistics["backtracks"]
+        for reason in statistics["pruned"]:
+            self.pruned[reason] += statistics["pruned"][reason]
+
+def get_process_pool(workers):
     """
-    Checks when encountering a filled position whether this is a previously solved positition, or an pre-set position.
-    :param r: row
-    :param c: column
-    :return: True if pre-set digit, False if previously solved position
+    Returns the process pool for parallel searching. The pool is made once and reused by later calls with the same number of workers.
+    :param workers: number of processes
+    :return: (pool, cancel event). Setting the cancel event stops the searches running in the pool.
     """
-    global moves
-    global field
-    global pi
-    global n
-    if [r,c] in list(zip(*moves))[0]: #previously solved position
-        return False
-    elif field[r,c] == unsolved_field[r,c]: #pre-filled position and correct digit
-        return True
-    elif field[r,c] != unsolved_field[r,c]: #pre-filled position and incorrect digit
-        return False
-    else: #shouldn't happen. Might be an artifact. Was added in VERSION 0.2 for bug-fixing purposes.
-        print("ERROR 1 potentially at match_init_digits (remove print and add comment if legit)")
-        return False
+    global process_pool
+    global process_pool_workers
+    global process_pool_cancel
+    if process_pool is None or process_pool_workers != workers:
+        if process_pool is not None:
+            process_pool.shutdown()
+        process_pool_cancel = multiprocessing.Event()
+        process_pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(process_pool_cancel,))
+        process_pool_workers = workers
+    return process_pool, process_pool_cancel
 
-def remove():
-    """"
-    remove the positions and numbers if it leads to a dead end. Go back as far as needed, then update position.
+def init_worker(cancel):
     """
-    global n
-    global field
-    global moves
-    global position
-    if moves[n][1] >= 4:
-        if n == 0: #when the starting position yields no solutions
-            return False
-        else:
-            if [moves[n][0][0], moves[n][0][1]] not in coordinates:
-                field[moves[n][0][0], moves[n][0][1]] = -1
-            moves.remove(moves[n])
-            n += -1
-            moves[n][1] += 1
-            if moves[n][1] == 4:
-                remove() #call remove() again if all options have already been tried for the new current position (prevents the count succeeding 4)
-        position = moves[n][0] #update position
-
-def solver(bugfix_type):
-    """
-    Solves the puzzle. Input bugfix_type for bugfixing options.
-    Prints the solution + taken route in coordinates and directions (0=right, 1=down, 2=left, 3=up)
-    """
-    global field
-    global n
-    global moves
-    global position
-    global r
-    global c
-    global failed_sp
-    #starting spot needs to be added
-    while n+1 != field.size: #or -1 in field: #contintue as long as there are no 'empty' fields and all fields have been 'visited'
-        while legal_position(new_position(moves[n][1])) != True:
-            moves[n][1] += 1 #log that a new move has been tried
-            if bugfix_type != 0:
-                if bugfix_type == 1:
-                    print("moves:", moves)
-                    print(field)
-                if bugfix_type == 2:
-                    print("moves:", moves)
-                if bugfix_type == 3:
-                    print(field)
-            if remove() == False: #check if removal is needed and remove log items if needed
-                return False
-        position = new_position(moves[n][1]) #make position the proposed position
-        r = position [0]
-        c = position [1]
-        n += 1 #keep track of progress
-        field[r, c] = int(pi[n]) #change field value to the corresponding digit of pi
-        try: #if moves[n] exists, update with new position, else create moves[n]
-            moves[n] = [position, 0, random.sample(list(range(4)), k=4), int(pi[n])]
-        except:
-            moves.append([position, 0, random.sample(list(range(4)), k=4), int(pi[n])])
-    return True
+    Runs once in every process of the pool to store the cancel event.
+    """
+    global worker_cancel
+    worker_cancel = cancel
 
-def start_solver (start_position , bugfix_type):
-    """
-    Puts the initial starting position in the field and calls solver(). Also checks for validity of bugfix_type input.
-    :param start_position: position of n(0) digit of pi (so 3)
-    :param bugfix_type: see solve(). If create_puzzle was called, this function is disabled (input 0).
-    :return: "solved" or "no solution"
-    """
-    global field
-    global r
-    global c
-    global moves
-    global position
-    global failed_sp
-    # initial value
-    r = start_position[0]
-    c = start_position [1]
-    field[r, c] = 3
-    moves = [[[r, c], 0, random.sample(list(range(4)), k=4), 3]]
-    position = [r, c]  # [row, column in field matrix]
-    if bugfix_type not in [0,1,2,3]:
-        print("Invalid input for bugfix type. Accepted inputs are 0, 1, 2, or 3. Program will run with bugfix disabled (input 0).")
-    if solver(bugfix_type) == True:
-        return "solved"
-    else:
-        failed_sp += 1
-        return "no solution"
-    print("ERROR start_solver: There is no solution")
+def search_task(field_dimensions, pre_set, start_position, route, engine, seed, prune, ordering):
+    """
+    Searches one starting position (or one route from it) in a process of the pool. Stops when the cancel event of the pool is set.
+    :param seed: seed for the random move order of this search
+    :param prune: see DopingSolver.prune
+    :param ordering: see DopingSolver.ordering
+    :return: (result of start_solver(), solved field or None, path taken or None, search statistics)
+    """
+    puzzle = DopingSolver(field_dimensions, pre_set, random.Random(seed))
+    puzzle.stop = worker_cancel
+    puzzle.prune = prune
+    puzzle.ordering = ordering
+    puzzle.create_field()
+    result = puzzle.start_solver(start_position, 0, engine, route)
+    if result == "solved":
+        return result, puzzle.field, puzzle.moves.path(), puzzle.statistics()
+    return result, None, None, puzzle.statistics()
+
+def parallel_search(puzzle, start_position, max_process_time, t1_start, engine, workers):
+    """
+    Searches with a pool of processes. For random starting positions, every process searches its own random starting position, like solve() does one by one.
+    For start_position "all", the processes take the positions of start_positions() in turn.
+    For a given starting position, the search is split into the routes of the first few moves, which are divided over the processes.
+    When there are no such routes (e.g. a field of one position), the search from the starting position is done in this process instead, so the outcome is the same as without processes.
+    The first process to find a solution stops the others.
+    :param puzzle: DopingSolver with the field created. Its failed_sp is updated like in the serial search.
+    :return: (starting position, solved field, path taken) or None if no solution was found
+    """
+    pool, cancel = get_process_pool(workers)
+    cancel.clear()
+    field_dimensions = puzzle.field_dimensions
+    found = None
+    pending = set()
+    if start_position == 0 or start_position == "all": #random starting positions or all starting positions, keep every process busy until the time is up
+        starts = {}
+        if start_position == "all":
+            queue = iter(start_positions(field_dimensions, puzzle.pre_set))
+        while perf_counter() - t1_start < max_process_time and found is None:
+            while len(pending) < workers:
+                if start_position == 0:
+                    start = [random.randint(0, field_dimensions[0] - 1), random.randint(0, field_dimensions[1] - 1)]
+                else:
+                    start = next(queue, None)
+                    if start is None: #all starting positions have been handed out
+                        break
+                task = pool.submit(search_task, field_dimensions, puzzle.pre_set, start, [], engine, random.getrandbits(64), puzzle.prune, puzzle.ordering)
+                starts[task] = start
+                pending.add(task)
+            if not pending:
+                break
+            done, pending = wait(pending, timeout=max(0, max_process_time - (perf_counter() - t1_start)), return_when=FIRST_COMPLETED)
+            for task in done:
+                result, field, path, statistics = task.result()
+                puzzle.add_statistics(statistics)
+                if result == "solved" and found is None:
+                    found = (starts[task], field, path)
+                    cancel.set()
+                elif result == "no solution":
+                    puzzle.failed_sp += 1
+    else: #given starting position, split the search into routes
+        size = puzzle.field.size
+        length = 1
+        routes = puzzle.routes(start_position, length)
+        while 0 < len(routes) < 4 * workers and length < min(8, size - 1):
+            length += 1
+            routes = puzzle.routes(start_position, length)
+        if not routes: #nothing to split: search in this process, so "no routes" is never taken as "no solution"
+            if puzzle.start_solver(start_position, 0, engine) == "solved":
+                found = (start_position, puzzle.field, puzzle.moves.path())
+        starts = {}
+        for route in routes:
+            task = pool.submit(search_task, field_dimensions, puzzle.pre_set, start_position, route, engine, random.getrandbits(64), puzzle.prune, puzzle.ordering)
+            starts[task] = start_position
+            pending.add(task)
+        while pending and found is None and perf_counter() - t1_start < max_process_time:
+            done, pending = wait(pending, timeout=max(0, max_process_time - (perf_counter() - t1_start)), return_when=FIRST_COMPLETED)
+            for task in done:
+                result, field, path, statistics = task.result()
+                puzzle.add_statistics(statistics)
+                if result == "solved" and found is None:
+                    found = (start_position, field, path)
+                    cancel.set()
+    cancel.set() #stop the searches that are still running when the time ran out
+    for task in pending:
+        task.cancel() #searches that haven't started yet
+    for task in pending: #searches that were already running when the time ran out or a solution was found
+        if task.cancelled():
+            continue
+        result, field, path, statistics = task.result()
+        puzzle.add_statistics(statistics)
+        if result == "solved" and found is None:
+            found = (starts[task], field, path)
+            cancel.set()
+        elif result == "no solution" and (start_position == 0 or start_position == "all"):
+            puzzle.failed_sp += 1
+    return found
 
-def solve(field_dimensions, pre_set = [0], start_position = 0, max_process_time = 30, bugfix_type = 0):
+def solve(field_dimensions, pre_set = [0], start_position = 0, max_process_time = 30, bugfix_type = 0, engine = "auto", workers = 1, prune = True, ordering = "random", show_statistics = False, hooks = None, node_budget = None):
     """
     Checks whether 'a' solution exists for a certain field with a given starting position, or for random starting positions.
     :param field_dimensions: 2 item list [rows, columns] to define the dimensions of the field you want to solve
     :param pre_set: input initial digits. pre_set = [ [[row,column], digit], [[row,column], digit], ... ]
-    :param start_position: 0 (default) for random start position. For custom start position, enter a 2 item list [row, column] to define the starting positions (where the 3 before the decimal point is placed)
-    :param max_process_time: max time in seconds for which the program will START searching for a solution with a new position. Default is 30s.
-    :param bugfix_type: 0 (default) bufix off; 1 for both field and moves; 2 for moves only; 3 for field only.
+    :param start_position: 0 (default) for random start position. "all" to try every starting position once (see start_positions()), which tells for sure whether the puzzle is unsolvable. For custom start position, enter a 2 item list [row, column] to define the starting positions (where the 3 before the decimal point is placed)
+    :param max_process_time: max time in seconds to search for a solution. Default is 30s. The search from one starting position is stopped as well when the time is up (see Deadline), so a given starting position is not searched longer either.
+    :param bugfix_type: 0 (default) bufix off; 1 for both field and moves; 2 for moves only; 3 for field only. Only available with the numpy engine.
+    :param engine: "auto" (default) for the frontier engine on long narrow fields and the bitboard engine on other fields (see engine_check()). "bitboard" for the fast search with precomputed tables, "numpy" for the original search. Both find the same solution for the same random seed when prune is off.
+                   "frontier" searches all starting positions at once (see frontier_search()), so with start_position 0 or "all" it tells for sure whether the puzzle is unsolvable. Its time grows with the length of the field instead of exponentially, for fields with few rows or columns.
+    :param workers: number of processes to search with. 1 (default) searches in this process, 0 uses all cpu cores. With more processes, the bugfix output is not available and the solution found depends on which process finishes first. The frontier engine always searches in this process.
+    :param prune: True (default) to skip moves after which the route can't be finished, see DopingSolver.bitboard_solver(). Bitboard engine only.
+    :param ordering: "random" (default) to try the moves in random order, "warnsdorff" to try the moves to positions with the fewest empty neighbours first. Bitboard engine only.
+    :param show_statistics: True to print how many positions were filled in, taken back and skipped by pruning.
+    :param hooks: SearchHooks to follow the search with, e.g. SearchProfile() to count the positions filled in and taken back per step and to time every starting position. Needs workers 1, as the hooks can't follow the search in other processes.
+    :param node_budget: maximum number of positions to fill in (see DopingSolver.node_budget), None (default) for no maximum. Needs workers 1 and is not used by the frontier engine.
     :return only the first solution found, or returns that no solution has been found, if none exists.
     """
     t1_start = perf_counter()
+    puzzle = DopingSolver(field_dimensions, pre_set)
     if field_check(field_dimensions, len(pre_set)) == True:
-        if create_field(field_dimensions, pre_set) == "impossible":  # create field and check for validity
+        if puzzle.create_field() == "impossible":  # create field and check for validity
             print(
                 f"At least one of your pre-filled digits is not present in the first {field_dimensions[0] * field_dimensions[1]} digits of pi, therefor this puzzle is impossible to solve.")
             return "Not succesful"
     else:
         return "Not succesful"
-    global field
-    global display_field
+    engine = engine_check(engine, bugfix_type, field_dimensions)
+    if ordering not in ["random", "warnsdorff"]:
+        print("Invalid input for ordering. Accepted inputs are 'random' or 'warnsdorff'. Program will run with random ordering.")
+        ordering = "random"
+    puzzle.prune = prune
+    puzzle.ordering = ordering
+    puzzle.hooks = hooks
+    puzzle.stop = Deadline(t1_start + max_process_time)
+    puzzle.node_budget = node_budget
+    if workers == 0:
+        workers = os.cpu_count()
+    if workers > 1 and bugfix_type in [1,2,3]:
+        print("The bugfix output is not available when searching with multiple processes. Program will search in this process only.")
+        workers = 1
+    if workers > 1 and hooks is not None:
+        print("The hooks can't follow the search in other processes. Program will search in this process only.")
+        workers = 1
+    if workers > 1 and node_budget is not None:
+        print("The node budget is only available when searching in this process. Program will search in this process only.")
+        workers = 1
+    limits = f"{max_process_time} seconds" if node_budget is None else f"{max_process_time} seconds or {node_budget} positions"
+    if engine == "frontier":
+        workers = 1
     print("Busy finding you a solution...")
-    if start_position == 0: #default is random start position
+    if engine == "frontier" and (start_position == 0 or start_position == "all"): #all starting positions at once
+        print("Searching all starting positions at once with the frontier engine...\n")
+        solved = puzzle.search_all(engine)
+        if solved == "solved":
+            print("\nSolution found!")
+            print(f"For the field \n{puzzle.display_field}\n with starting position {puzzle.moves.coordinates(0)}, a solution is:\n\n {puzzle.field}\n\nThe path taken is: {puzzle.moves.path()}")
+            if show_statistics == True:
+                puzzle.print_statistics(perf_counter() - t1_start)
+            return "Succesful"
+        elif solved == "stopped":
+            print(f"\nNo solution found for field \n{puzzle.display_field}\nin {max_process_time} seconds, so it is not yet sure whether the puzzle is unsolvable.")
+        else:
+            print(f"No solution exists for the field \n{puzzle.display_field}\nfrom any starting position.")
+            print("Sorry, I'm afraid your puzzle is unsolvable :(")
+    elif start_position == 0: #default is random start position
         print("Trying out multiple starting positions for max", max_process_time, "seconds...\n")
-        while perf_counter() - t1_start < max_process_time:
+        found = None
+        if workers > 1:
+            found = parallel_search(puzzle, start_position, max_process_time, t1_start, engine, workers)
+        while workers == 1 and perf_counter() - t1_start < max_process_time and not puzzle.interrupted():
             start_position = [random.randint(0, field_dimensions[0]-1), random.randint(0, field_dimensions[1]-1)]
-            if start_solver(start_position, bugfix_type) == "solved":
-                print("\nSolution found!")
-                print(f"For the field \n{display_field}\n with starting position {start_position}, a solution is:\n\n {field}\n\nThe path taken is: {list(zip(*moves))[0]}")
-                return "Succesful"
-            create_field(field_dimensions, pre_set) #reset field
+            if puzzle.start_solver(start_position, bugfix_type, engine) == "solved":
+                found = (start_position, puzzle.field, puzzle.moves.path())
+                break
+            puzzle.reset_field()
             if bugfix_type == 1:
                 print("time elapsed", perf_counter()-t1_start)
-        print(f"\nNo solution found for field \n{display_field}\nwith random starting positions in {max_process_time} seconds.")
-        print(failed_sp, "starting positions were analysed in this run.")
+        if found is not None:
+            start_position, field, path = found
+            print("\nSolution found!")
+            print(f"For the field \n{puzzle.display_field}\n with starting position {start_position}, a solution is:\n\n {field}\n\nThe path taken is: {path}")
+            if show_statistics == True:
+                puzzle.print_statistics(perf_counter() - t1_start)
+            return "Succesful"
+        print(f"\nNo solution found for field \n{puzzle.display_field}\nwith random starting positions in {limits}.")
+        print(puzzle.failed_sp, "starting positions were analysed in this run.")
+    elif start_position == "all": #every starting position once
+        starts = start_positions(field_dimensions, pre_set)
+        print(f"Trying all {len(starts)} starting positions that can lead to a solution (the other positions are turned copies of these or can't lead to a solution) for max", max_process_time, "seconds...\n")
+        found = None
+        if workers > 1:
+            found = parallel_search(puzzle, start_position, max_process_time, t1_start, engine, workers)
+        else:
+            for start in starts:
+                if perf_counter() - t1_start >= max_process_time or puzzle.interrupted():
+                    break
+                if puzzle.start_solver(start, bugfix_type, engine) == "solved":
+                    found = (start, puzzle.field, puzzle.moves.path())
+                    break
+                puzzle.reset_field()
+                if bugfix_type == 1:
+                    print("time elapsed", perf_counter()-t1_start)
+        if found is not None:
+            start_position, field, path = found
+            print("\nSolution found!")
+            print(f"For the field \n{puzzle.display_field}\n with starting position {start_position}, a solution is:\n\n {field}\n\nThe path taken is: {path}")
+            if show_statistics == True:
+                puzzle.print_statistics(perf_counter() - t1_start)
+            return "Succesful"
+        if puzzle.failed_sp == len(starts):
+            print(f"No solution exists for the field \n{puzzle.display_field}\nfrom any of the {len(starts)} starting positions.")
+            print("Sorry, I'm afraid your puzzle is unsolvable :(")
+            if show_statistics == True:
+                puzzle.print_statistics(perf_counter() - t1_start)
+            return "Not succesful"
+        print(f"\nNo solution found for field \n{puzzle.display_field}\nin {limits}.")
+        print(puzzle.failed_sp, "of the", len(starts), "starting positions were analysed in this run, so it is not yet sure whether the puzzle is unsolvable.")
     else:
-        if start_solver(start_position , bugfix_type) == "solved":
-            print(f"For the field \n{display_field}\n with starting position {start_position}, a solution is:\n\n {field}\n\nThe path taken is: {list(zip(*moves))[0]}")
+        if workers > 1:
+            found = parallel_search(puzzle, start_position, max_process_time, t1_start, engine, workers)
+            stopped = found is None and perf_counter() - t1_start >= max_process_time
+        else:
+            result = puzzle.start_solver(start_position , bugfix_type, engine)
+            found = (start_position, puzzle.field, puzzle.moves.path()) if result == "solved" else None
+            stopped = result == "stopped"
+        if found is not None:
+            start_position, field, path = found
+            print(f"For the field \n{puzzle.display_field}\n with starting position {start_position}, a solution is:\n\n {field}\n\nThe path taken is: {path}")
+            if show_statistics == True:
+                puzzle.print_statistics(perf_counter() - t1_start)
             return "Succesful"
+        elif stopped:
+            print(f"No solution found for the field {puzzle.display_field} with starting position {start_position} in {limits}, so it is not yet sure whether the puzzle is unsolvable.")
         else:
-            print(f"No solution exists for the field {display_field} with starting position {start_position}")
+            print(f"No solution exists for the field {puzzle.display_field} with starting position {start_position}")
             print("Sorry, I'm afraid your puzzle is unsolvable :(")
+    if show_statistics == True:
+        puzzle.print_statistics(perf_counter() - t1_start)
     return "Not succesful"
 
-def create_puzzle(field_dimensions, number_of_digits = 1, max_process_time = 30):
+def search_puzzle(field_dimensions, pre_set = [0], start_position = 0, max_process_time = 30, engine = "auto", node_budget = None, stop = None):
+    """
+    Searches for a solution like solve(), but without printing, and returns the outcome instead, e.g. to use the solver from another program (see solve_async()).
+    Searches in this process only, with the search stopped at max_process_time (see Deadline), after node_budget positions or when stop is set.
+    :param field_dimensions: see solve()
+    :param pre_set: see solve()
+    :param start_position: see solve()
+    :param max_process_time: maximum time in seconds to search
+    :param engine: see solve()
+    :param node_budget: maximum number of positions to fill in, None (default) for no maximum, see DopingSolver.node_budget
+    :param stop: event that stops the search when set, e.g. to cancel it from another thread. Default is none.
+    :return: dictionary with "result": "solved", "no solution" (sure: the field, or the starting position, has no solution) or "stopped" (time or node budget used up, or stop set), "start", "field" and "path" of the solution (None when not solved),
+             "time" in seconds and the "statistics" of the search (see DopingSolver.statistics()), also when stopped
+    """
+    t1_start = perf_counter()
+    puzzle = DopingSolver(field_dimensions, pre_set)
+    puzzle.stop = Deadline(t1_start + max_process_time, stop)
+    puzzle.node_budget = node_budget
+    result = "no solution"
+    start = start_position
+    if field_issue(field_dimensions, len(pre_set)) is None and puzzle.create_field() != "impossible":
+        engine = engine_check(engine, 0, field_dimensions)
+        if start_position == "all" or engine == "frontier" and start_position == 0: #every starting position, all at once with the frontier engine
+            result = puzzle.search_all(engine)
+            start = puzzle.moves.coordinates(0) if result == "solved" else None
+        elif start_position == 0: #random starting positions until solved or stopped
+            result = "stopped"
+            while not puzzle.interrupted():
+                start = [random.randint(0, field_dimensions[0] - 1), random.randint(0, field_dimensions[1] - 1)]
+                if puzzle.start_solver(start, 0, engine) == "solved":
+                    result = "solved"
+                    break
+                puzzle.reset_field()
+        else:
+            result = puzzle.start_solver(start_position, 0, engine)
+    solved = result == "solved"
+    return {"result": result, "start": list(start) if solved else None, "field": puzzle.field.tolist() if solved else None, "path": puzzle.moves.path() if solved else None,
+            "time": perf_counter() - t1_start, "statistics": puzzle.statistics()}
+
+async def solve_async(field_dimensions, pre_set = [0], start_position = 0, max_process_time = 30, engine = "auto", node_budget = None, executor = None):
+    """
+    Searches for a solution with search_puzzle() in an executor, so an asyncio program (e.g. a server handling requests) can go on while the search runs.
+    Requests for the same puzzle (dimensions, pre-set digits, starting position and engine) that come in while it is searched wait for that search instead of starting another one, with its max_process_time and node_budget.
+    Sure outcomes ("solved" or "no solution") are kept for the last solve_cache_size puzzles, and given right away when asked again.
+    When the task waiting for the outcome is cancelled (e.g. by asyncio.wait_for()), the search is stopped, unless other requests are still waiting for it.
+    :param field_dimensions: see solve()
+    :param pre_set: see solve()
+    :param start_position: see solve()
+    :param max_process_time: maximum time in seconds to search
+    :param engine: see solve()
+    :param node_budget: maximum number of positions to fill in, None (default) for no maximum
+    :param executor: executor to search in, None (default) for the default executor of the event loop. It has to run the search in a thread of this process, as the search is stopped through a threading.Event.
+    :return: dictionary with the outcome, see search_puzzle(). Requests for the same puzzle get the same dictionary, so it shouldn't be changed.
+    """
+    key = json.dumps([field_dimensions, pre_set, start_position, engine])
+    if key in solve_cache:
+        solve_cache.move_to_end(key)
+        return solve_cache[key]
+    request = solve_requests.get(key) #[search, stop event, number of requests waiting]
+    if request is None:
+        stop = threading.Event()
+        search = asyncio.get_running_loop().run_in_executor(executor, search_puzzle, field_dimensions, pre_set, start_position, max_process_time, engine, node_budget, stop)
+        request = solve_requests[key] = [search, stop, 0]
+        def done(search): #keep the outcome when it is sure
+            if solve_requests.get(key) is request:
+                del solve_requests[key]
+            if not search.cancelled() and search.exception() is None and search.result()["result"] != "stopped":
+                solve_cache[key] = search.result()
+                while len(solve_cache) > solve_cache_size:
+                    solve_cache.popitem(last=False)
+        search.add_done_callback(done)
+    request[2] += 1
+    try:
+        return await asyncio.shield(request[0])
+    except asyncio.CancelledError:
+        if request[2] == 1: #no other requests waiting for this search
+            request[1].set()
+            if solve_requests.get(key) is request:
+                del solve_requests[key]
+        raise
+    finally:
+        request[2] += -1
+
+def hint(field_dimensions, pre_set, board, random_position = False, max_process_time = 30, rng = random):
+    """
+    Gives a hint for a puzzle that is partly filled in: the next position of the route, or a random position that is still empty, with its digit.
+    The solutions found are kept per puzzle (for the last hint_cache_size puzzles), so when the filled in digits agree with one of them, the hint is given right away.
+    Otherwise the search goes on from the route filled in so far (see DopingSolver.filled_routes()), with the other digits filled in as pre-set digits, instead of starting over.
+    When no solution continues any of the routes (e.g. as a filled in 3 is a later 3 of pi), all starting positions are searched with the digits filled in as pre-set digits.
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits of the puzzle, see solve()
+    :param board: the field as filled in so far, as rows of digits with -1 for the empty positions (e.g. a numpy array like DopingSolver.field). The pre-set digits don't need to be in it.
+    :param random_position: False (default) for the next position of the route, True for a random empty position
+    :param max_process_time: maximum time in seconds to search when none of the kept solutions agrees with the board, see Deadline
+    :param rng: random.Random instance for choosing the random position. Default is the random module.
+    :return: ([row, column], digit) of the hint, or None when the board is full or no solution agrees with it (something filled in is wrong, or the time ran out)
+    """
+    rows, columns = field_dimensions
+    key = json.dumps([field_dimensions, pre_set])
+    solutions = hint_cache.get(key) #[route as position indices, digit per position index] of every solution found
+    if solutions is None:
+        solutions = hint_cache[key] = []
+        while len(hint_cache) > hint_cache_size:
+            hint_cache.popitem(last=False)
+    hint_cache.move_to_end(key)
+    filled = {r * columns + c: digit for (r, c), digit in ([] if pre_set == [0] else pre_set)} #digit per filled in position index
+    entered = set() #position indices filled in by the user
+    for r in range(rows):
+        for c in range(columns):
+            if board[r][c] != -1 and r * columns + c not in filled:
+                filled[r * columns + c] = int(board[r][c])
+                entered.add(r * columns + c)
+    if len(filled) == rows * columns:
+        return None
+    solution = next((solution for solution in solutions if all(solution[1][i] == digit for i, digit in filled.items())), None)
+    if solution is None: #search from the route filled in so far
+        entries = [[[i // columns, i % columns], digit] for i, digit in sorted(filled.items())]
+        puzzle = DopingSolver(field_dimensions, entries if entries else [0])
+        if puzzle.create_field() == "impossible":
+            return None
+        puzzle.stop = Deadline(perf_counter() + max_process_time)
+        engine = engine_check("auto", 0, field_dimensions)
+        result = "no solution"
+        for route in puzzle.filled_routes(entered):
+            result = puzzle.start_solver(route[0], 0, engine, route[1:])
+            if result != "no solution":
+                break
+            puzzle.reset_field()
+        if result == "no solution": #no route continues, search all starting positions
+            result = puzzle.search_all(engine)
+        if result != "solved":
+            return None
+        solution = [list(puzzle.moves.position), puzzle.field.flatten().tolist()]
+        solutions.append(solution)
+        if len(solutions) > 16: #keep the latest solutions only
+            del solutions[0]
+    empty = [i for i in solution[0] if i not in filled]
+    i = rng.choice(empty) if random_position == True else empty[0]
+    return [i // columns, i % columns], solution[1][i]
+
+def make_unique(field_dimensions, field, pre_set, rng = random, statistics = None, stop = None):
+    """
+    Pre-sets digits of a solution until it is the only solution of the puzzle, then takes away the pre-set digits that aren't needed for that.
+    As long as the puzzle has another solution (see DopingSolver.count_solutions()), the digit at a random position where the other solution differs is pre-set as well.
+    Then the pre-set digits are tried in random order and taken away when the solution stays unique without them, so in the end every pre-set digit is needed.
+    :param field_dimensions: [number of rows, number of columns]
+    :param field: solved field the puzzle is made from
+    :param pre_set: digits of the solution to pre-set to begin with, see solve()
+    :param rng: random.Random instance for the random choices. Default is the random module.
+    :param statistics: DopingSolver to add the search statistics of every count to (see DopingSolver.add_statistics()), e.g. for benchmark(). Default is none.
+    :param stop: event that stops the counting when set, e.g. a Deadline (see DopingSolver.stop). Default is none.
+    :return: pre-set digits with which field is the only solution, or None when another route gives the same digits (so no pre-set digit can tell them apart) or when stopped
+    """
+    columns = field_dimensions[1]
+    def count(pre_set): #solver with the solutions counted up to 2, None when stopped
+        puzzle = DopingSolver(field_dimensions, pre_set if pre_set else [0], rng)
+        puzzle.create_field()
+        puzzle.stop = stop
+        counted = puzzle.count_solutions(2)
+        if statistics is not None:
+            statistics.add_statistics(puzzle.statistics())
+        return None if counted is None else puzzle
+    pre_set = [] if pre_set == [0] else list(pre_set)
+    puzzle = count(pre_set)
+    while puzzle is not None and puzzle.found > 1:
+        differs = [] #positions where another solution has another digit
+        for solution in puzzle.solutions:
+            differs = [[i // columns, i % columns] for k, i in enumerate(solution) if puzzle.digits[k] != field[i // columns, i % columns]]
+            if differs:
+                break
+        if not differs:
+            return None
+        r, c = rng.choice(differs)
+        pre_set.append([[r, c], int(field[r, c])])
+        puzzle = count(pre_set)
+    if puzzle is None:
+        return None
+    for digit in rng.sample(pre_set, len(pre_set)):
+        rest = [x for x in pre_set if x is not digit]
+        puzzle = count(rest)
+        if puzzle is None:
+            return None
+        if puzzle.found == 1:
+            pre_set = rest
+    return pre_set if pre_set else [0]
+
+def generate_puzzle(field_dimensions, number_of_digits = 1, max_process_time = 30, rng = None, statistics = None):
+    """
+    Creates a puzzle with exactly one solution without asking for any input, e.g. to make puzzles in the background.
+    Finds a solution from random starting positions, pre-sets number_of_digits random digits of it and then pre-sets or takes away digits with make_unique().
+    So the puzzle can end up with more or fewer pre-set digits than number_of_digits.
+    :param field_dimensions: dimensions of the playing field [number of rows, number of columns]
+    :param number_of_digits: number of random digits to pre-set before making the solution unique. Default is 1 digit.
+    :param max_process_time: maximum time in seconds to find a solution and make it unique, see Deadline.
+    :param rng: random.Random instance for the random choices, e.g. random.Random(seed) to get the same puzzle again. Default is the random module.
+    :param statistics: DopingSolver to add the search statistics of finding the solution and of make_unique() to, see DopingSolver.add_statistics(). Default is none.
+    :return: (pre-set digits in the format of solve(), solved field, path taken) or None if no solution was found in time
+    """
+    rng = random if rng is None else rng
+    if field_check(field_dimensions, number_of_digits) == False:
+        return None
+    rows, columns = field_dimensions
+    positions = [[r, c] for r in range(rows) for c in range(columns)]
+    puzzle = DopingSolver(field_dimensions, rng=rng)
+    puzzle.create_field()
+    t1_start = perf_counter()
+    puzzle.stop = Deadline(t1_start + max_process_time)
+    generated = None
+    while perf_counter() - t1_start < max_process_time and generated is None:
+        start = [rng.randint(0, rows - 1), rng.randint(0, columns - 1)]
+        if puzzle.start_solver(start) == "solved":
+            pre_set = [[[r, c], int(puzzle.field[r, c])] for r, c in rng.sample(positions, number_of_digits)]
+            pre_set = make_unique(field_dimensions, puzzle.field, pre_set, rng, statistics, puzzle.stop) #in the time that is left
+            if pre_set is not None:
+                generated = (pre_set, puzzle.field.copy(), puzzle.moves.path())
+        puzzle.reset_field()
+    if statistics is not None:
+        statistics.add_statistics(puzzle.statistics())
+    return generated
+
+def generate_task(field_dimensions, number_of_digits, max_process_time, seed):
+    """
+    Generates one puzzle for generate_puzzles(), in this process or in a process of the pool.
+    :param seed: seed for the random choices of this puzzle
+    :return: dictionary with the puzzle, see generate_puzzles(), or None if no solution was found in time
+    """
+    generated = generate_puzzle(field_dimensions, number_of_digits, max_process_time, random.Random(seed))
+    if generated is None:
+        return None
+    pre_set, field, path = generated
+    return {"dimensions": list(field_dimensions), "seed": seed, "pre_set": pre_set, "solution": field.tolist(), "path": [list(position) for position in path]}
+
+def generate_puzzles(field_dimensions, number_of_digits = 1, count = 1, seed = None, workers = 1, max_process_time = 30):
+    """
+    Generates many puzzles with exactly one solution without any input, see generate_puzzle().
+    The puzzles are made while they are asked for (a generator), so any number of them can be made and written away without keeping them in memory.
+    With more workers, the next few puzzles are made in a pool of processes. They are still given in the same order.
+    Every puzzle gets its own seed from seed, so the same seed gives the same puzzles, also with another number of workers.
+    :param field_dimensions: dimensions of the playing field [number of rows, number of columns]
+    :param number_of_digits: number of random digits to pre-set before making the solution unique, see generate_puzzle()
+    :param count: number of puzzles
+    :param seed: seed for the puzzles. Default None gives other puzzles every run.
+    :param workers: number of processes to generate with. 1 (default) generates in this process, 0 uses all cpu cores.
+    :param max_process_time: maximum time in seconds to find a solution for each puzzle. When it runs out, a TimeoutError is raised after the puzzles made before.
+    :return: generator of dictionaries with the dimensions, the seed of the puzzle, the pre-set digits (in the format of solve()), the solved field and the path taken. Raises a ValueError when the field can't be made (see field_issue()).
+    """
+    issue = field_issue(field_dimensions, number_of_digits)
+    if issue is not None:
+        raise ValueError(issue)
+    seeds = random.Random(seed)
+    if workers == 0:
+        workers = os.cpu_count()
+    pending = deque() #puzzles being made by the pool, in order
+    made = 0
+    if workers > 1:
+        pool = get_process_pool(workers)[0]
+    try:
+        while made < count:
+            if workers > 1:
+                while len(pending) < 2 * workers and made + len(pending) < count: #keep every process busy
+                    pending.append(pool.submit(generate_task, field_dimensions, number_of_digits, max_process_time, seeds.getrandbits(64)))
+                record = pending.popleft().result()
+            else:
+                record = generate_task(field_dimensions, number_of_digits, max_process_time, seeds.getrandbits(64))
+            if record is None: #not skipped, as a field without solutions would then never stop
+                raise TimeoutError(f"Couldn't find a solution for a {field_dimensions} field within {max_process_time} seconds, stopped after {made} puzzles.")
+            made += 1
+            yield record
+    finally: #also when the generator isn't used up
+        for task in pending:
+            task.cancel()
+
+def build_atlas(max_rows, max_columns, max_process_time = 60):
+    """
+    Finds out for every field of up to max_rows by max_columns positions whether it has a solution, by searching all starting positions (see start_positions()).
+    The answers are added to the atlas file (see atlas_entry()) for the field and its transpose, with one solution of every solvable field.
+    With the atlas, field_check() turns down fields without solutions right away and create_puzzle() can start from a stored solution instead of searching.
+    Fields that are in the atlas already are skipped, so the atlas can be extended by running it again with bigger fields or more time. Meant to be run once, as searching big fields takes long.
+    :param max_rows: maximum number of rows
+    :param max_columns: maximum number of columns
+    :param max_process_time: maximum time in seconds to search one field. Fields that take longer are left out of the atlas.
+    :return: number of fields added to the atlas
+    """
+    atlas_entry([0, 0]) #read the atlas file into atlas_cache
+    moves = {(0, 1): "R", (1, 0): "D", (0, -1): "L", (-1, 0): "U"}
+    added = 0
+    for rows in range(1, max_rows + 1):
+        for columns in range(1, max_columns + 1):
+            if atlas_entry([rows, columns]) is not None:
+                continue
+            puzzle = DopingSolver([rows, columns])
+            puzzle.create_field()
+            puzzle.stop = Deadline(perf_counter() + max_process_time)
+            result = puzzle.search_all()
+            if result == "stopped":
+                print(f"Searching a {[rows, columns]} field took longer than {max_process_time} seconds, it is left out of the atlas.")
+                continue
+            if result == "solved":
+                path = puzzle.moves.path()
+                route = "".join(moves[(path[k + 1][0] - path[k][0], path[k + 1][1] - path[k][1])] for k in range(len(path) - 1))
+                atlas_cache[f"{rows}x{columns}"] = {"solvable": True, "start": path[0], "path": route}
+                atlas_cache[f"{columns}x{rows}"] = {"solvable": True, "start": path[0][::-1], "path": route.translate(str.maketrans("RDLU", "DRUL"))} #mirrored in the diagonal
+            else:
+                atlas_cache[f"{rows}x{columns}"] = {"solvable": False}
+                atlas_cache[f"{columns}x{rows}"] = {"solvable": False}
+            print(f"A {[rows, columns]} field {'has' if result == 'solved' else 'has no'} solutions.")
+            added += 1
+            with open(atlas_file + ".tmp", "w") as f: #written after every field, so a long run can be stopped without losing the fields done
+                json.dump(atlas_cache, f, sort_keys=True)
+            os.replace(atlas_file + ".tmp", atlas_file)
+    return added
+
+def benchmark_puzzle(case):
+    """
+    Makes the puzzle of a benchmark case from the solution of the field in the atlas (see atlas_witness()), so a case always gives the same puzzle.
+    :param case: benchmark case, see benchmark_case()
+    :return: (pre-set digits in the format of solve(), starting position of the solution in the atlas or None if the atlas has no solution for the field)
+    """
+    rng = random.Random(case["seed"])
+    witness = atlas_witness(case["dimensions"], rng)
+    if witness is None:
+        if case["clues"] > 0 or case["start"] == "fixed":
+            raise ValueError(f"Benchmark cases with pre-set digits or a fixed starting position need a field with a solution in the atlas, which a {case['dimensions']} field hasn't.")
+        return [0], None
+    digits = pi_digits(len(witness))
+    pre_set = [[witness[k], digits[k]] for k in sorted(rng.sample(range(len(witness)), case["clues"]))]
+    return (pre_set if pre_set else [0]), witness[0]
+
+def benchmark_case(case, max_process_time = 30):
+    """
+    Runs one benchmark case. A case is a dictionary with:
+    - "task": "solve" to solve a puzzle, "generate" to generate a puzzle with exactly one solution (see generate_puzzle());
+    - "dimensions": [number of rows, number of columns];
+    - "clues": number of pre-set digits, taken from the solution in the atlas (see benchmark_puzzle()), or the number_of_digits of generate_puzzle();
+    - "start": "fixed" for the starting position of the solution in the atlas, "random" for random starting positions or "all" for all starting positions (see start_positions()). The frontier engine searches all starting positions at once for "random" and "all". Not used for "generate";
+    - "engine": see solve(). Not used for "generate";
+    - "seed": seed for the random choices, so the case searches the same way every run.
+    :param max_process_time: maximum time in seconds for the case
+    :return: dictionary with the outcome ("solved", "no solution" or "stopped"), the time in seconds and the search statistics (see DopingSolver.statistics())
+    """
+    rng = random.Random(case["seed"])
+    field_dimensions = case["dimensions"]
+    if case["task"] == "generate":
+        puzzle = DopingSolver(field_dimensions) #only to add up the statistics of generate_puzzle()
+        t1_start = perf_counter()
+        generated = generate_puzzle(field_dimensions, case["clues"], max_process_time, rng, puzzle)
+        time_elapsed = perf_counter() - t1_start
+        result = "stopped" if generated is None else "solved"
+    else:
+        pre_set, start = benchmark_puzzle(case)
+        puzzle = DopingSolver(field_dimensions, pre_set, rng)
+        puzzle.create_field()
+        engine = engine_check(case["engine"], 0, field_dimensions)
+        t1_start = perf_counter()
+        puzzle.stop = Deadline(t1_start + max_process_time)
+        if case["start"] == "fixed":
+            result = puzzle.start_solver(start, 0, engine)
+        elif engine == "frontier" or case["start"] == "all":
+            result = puzzle.search_all(engine)
+        else:
+            result = "stopped"
+            while not puzzle.stop.is_set():
+                start = [rng.randint(0, field_dimensions[0] - 1), rng.randint(0, field_dimensions[1] - 1)]
+                if puzzle.start_solver(start, 0, engine) == "solved":
+                    result = "solved"
+                    break
+                puzzle.reset_field()
+        time_elapsed = perf_counter() - t1_start
+    statistics = puzzle.statistics()
+    return {"result": result, "time": time_elapsed, "nodes": statistics["nodes"], "nodes_per_second": statistics["nodes"] / max(time_elapsed, 1e-9), "backtracks": statistics["backtracks"], "pruned": statistics["pruned"]}
+
+def benchmark_label(case):
+    """
+    :return: short description of a benchmark case, which is also used to find the same case in another benchmark
+    """
+    if case["task"] == "generate":
+        return f"generate {case['dimensions'][0]}x{case['dimensions'][1]} digits {case['clues']} seed {case['seed']}"
+    return f"solve {case['dimensions'][0]}x{case['dimensions'][1]} clues {case['clues']} start {case['start']} {case['engine']} seed {case['seed']}"
+
+def benchmark(matrix = None, repeat = 3, max_process_time = 30, memory = True):
+    """
+    Runs a fixed set of seeded cases (see benchmark_case()) to measure the speed of the search, e.g. to compare engines or to check a change for slowdowns with compare_benchmarks().
+    Every case is run repeat times and the fastest time is kept, so the first run can fill the caches (digits of pi, neighbour tables) without being counted.
+    As the cases are seeded, every run of a case searches the same positions, so the number of positions filled in ("nodes") and taken back only change when the search itself changes.
+    :param matrix: list of cases, see benchmark_case(). Default is benchmark_matrix.
+    :param repeat: number of timed runs of every case. Default is 3.
+    :param max_process_time: maximum time in seconds for each run of a case
+    :param memory: True (default) to run every case once more with tracemalloc to measure the peak memory use in bytes. Not done in the timed runs, as tracemalloc slows down the search.
+    :return: dictionary with the Python version, machine, settings and the results of all cases, which can be written with json.dump()
+    """
+    cases = []
+    for case in (benchmark_matrix if matrix is None else matrix):
+        runs = [benchmark_case(case, max_process_time) for k in range(repeat)]
+        result = dict(case, **min(runs, key=lambda run: run["time"]))
+        if memory == True:
+            tracemalloc.start()
+            benchmark_case(case, max_process_time)
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"{benchmark_label(case)}: {result['result']} in {result['time']:.3f}s, {result['nodes']} positions filled in ({result['nodes_per_second']:.0f} per second), {result['backtracks']} taken back", file=sys.stderr)
+        cases.append(result)
+    return {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat, "max_process_time": max_process_time, "cases": cases}
+
+def compare_benchmarks(results, baseline, tolerance = 0.1):
+    """
+    Compares the results of benchmark() with earlier results, e.g. read from a file written by the benchmark command.
+    A case is slower when its time (or peak memory) is more than tolerance above that of the baseline. Differences of less than 10 ms are left out, as such short times vary too much between runs.
+    A case also counts as worse when it was solved in the baseline but isn't now.
+    A different number of positions filled in is reported but not counted as worse, as that is what a change of the search is meant to do.
+    :param results: results of benchmark()
+    :param baseline: results of benchmark() to compare with. Cases that are not in both are left out.
+    :param tolerance: allowed fraction of slowdown. Default is 0.1 (10%).
+    :return: list of (label, time relative to the baseline, nodes relative to the baseline, list of what got worse) per case, see benchmark_label()
+    """
+    earlier = {benchmark_label(case): case for case in baseline["cases"]}
+    comparison = []
+    for case in results["cases"]:
+        label = benchmark_label(case)
+        if label not in earlier:
+            continue
+        old = earlier[label]
+        worse = []
+        if old["result"] == "solved" and case["result"] != "solved":
+            worse.append(case["result"])
+        if case["time"] > old["time"] * (1 + tolerance) and case["time"] - old["time"] > 0.01:
+            worse.append("time")
+        if "peak_memory" in case and "peak_memory" in old and case["peak_memory"] > old["peak_memory"] * (1 + tolerance):
+            worse.append("memory")
+        comparison.append((label, case["time"] / max(old["time"], 1e-9), case["nodes"] / max(old["nodes"], 1), worse))
+    return comparison
+
+def create_puzzle(field_dimensions, number_of_digits = 1, max_process_time = 30, engine = "auto", start_position = 0, prune = True, ordering = "random", unique = False, use_atlas = False):
     """
     Creates solvable puzzles with the option to see the corresponding solutions.
     :param field_dimensions: dimensions of the playing field [number of rows, number of columns]
     :param number_of_digits: number of digits you want to be pre-filled in the field. Default is 1 digit.
-    :param max_process_time: maximum time in seconds to try new random starting positions for the field before giving up on finding a new starting position with a solution. Default is half a minute.
+    :param max_process_time: maximum time in seconds to try new random starting positions for the field before giving up on finding a new starting position with a solution. Default is half a minute. The search from one starting position is stopped as well when the time is up (see Deadline).
+    :param engine: "auto" (default), "bitboard", "numpy" or "frontier", see solve().
+    :param start_position: 0 (default) for random starting positions, "all" to try every starting position once (see start_positions()). The frontier engine first searches all starting positions at once, which tells for sure whether the field has a solution.
+    :param prune: see solve().
+    :param ordering: "random" (default) or "warnsdorff", see solve().
+    :param unique: True to make puzzles with only one solution, see make_unique(). The number of pre-filled digits is then whatever is needed for that. Use generate_puzzle() to make such puzzles without any input.
+    :param use_atlas: True to start from the solution stored in the atlas (see build_atlas()), turned randomly, instead of searching for one. Fields that are not in the atlas are searched as usual.
     :return: User gets to see the puzzle(s) and optionally the solution(s). The return values are arbitrary and exist merely to end the program.
     """
     if field_check(field_dimensions, number_of_digits) == True:
+        engine = engine_check(engine, 0, field_dimensions)
         play_again = "Y" #default start the program
     else:
         return "Fail. End of program"
     while play_again in ["Y","y","yes","Yes"]: #continue for as long as the user wants
-        reset_variables() #start with clean slate
+        puzzle = DopingSolver(field_dimensions) #start with clean slate
+        puzzle.prune = prune
+        puzzle.ordering = ordering
         t1_start = perf_counter()
-        create_field(field_dimensions, [0])
-        global field
-        global display_field
+        puzzle.stop = Deadline(t1_start + max_process_time)
+        puzzle.create_field()
         print("Construction a DoPing puzzle for you...")
         puzzle_made = False
+        searched_all = engine != "frontier" #the frontier engine searches all starting positions at once first, like solve()
+        if start_position == "all":
+            starts = iter(start_positions(field_dimensions))
         while perf_counter() - t1_start < max_process_time and puzzle_made == False:
-            start_position = [random.randint(0, field_dimensions[0] - 1), random.randint(0, field_dimensions[1] - 1)]
-            if start_solver(start_position, 0) == "solved":
-                i=0
+            witness = atlas_witness(field_dimensions) if use_atlas == True else None
+            if witness is not None: #the stored solution as a fixed route, so there's nothing left to search
+                result = puzzle.start_solver(witness[0], 0, engine, witness[1:])
+            elif searched_all == False:
+                searched_all = True #when its solution can't be made unique, the starting positions below are searched for other solutions
+                result = puzzle.search_all(engine)
+                if result == "no solution":
+                    print(f"There are no solutions for a {field_dimensions} field.")
+                    return "Fail. End of program"
+            elif start_position == "all":
+                start = next(starts, None)
+                if start is None: #all starting positions have been tried
+                    print(f"There are no solutions for a {field_dimensions} field.")
+                    return "Fail. End of program"
+                result = puzzle.start_solver(start, 0, engine)
+            else:
+                result = puzzle.start_solver([random.randint(0, field_dimensions[0] - 1), random.randint(0, field_dimensions[1] - 1)], 0, engine)
+            if result == "solved":
+                display_field = puzzle.display_field
                 while np.count_nonzero(display_field != "_") < number_of_digits: #put number_of_digits digits in the unsolved field.
                     r = random.randint(0, field_dimensions[0] - 1) #select random row
                     c = random.randint(0, field_dimensions[1] - 1) #select random column
-                    display_field[r,c] = field[r,c] #insert the selected digits in the display field
+                    display_field[r,c] = puzzle.field[r,c] #insert the selected digits in the display field
+                if unique == True:
+                    pre_set = make_unique(field_dimensions, puzzle.field, [[[r, c], int(puzzle.field[r, c])] for r, c in zip(*np.nonzero(display_field != "_"))], stop=puzzle.stop)
+                    display_field[:] = "_"
+                    if pre_set is None: #no pre-set digits can make this solution unique (or the time ran out), try another one
+                        puzzle.reset_field()
+                        continue
+                    if pre_set != [0]:
+                        for (r, c), digit in pre_set:
+                            display_field[r, c] = digit
                 print("Your puzzle:\n\n", display_field) #give the user the puzzle
                 show_solution = "" #to show solution
                 while show_solution not in ["Y","y","yes","Yes", "N", "n", "no", "No"]: #show solution when user wants it. In a loop to force a correct (yes/no) input
                     show_solution = input("Do you want to see the solution? Y/N")
                     if show_solution in ["Y","y","yes","Yes"]:
-                        print(field, "\n\nmoves:\n", list(zip(*moves))[0])
+                        print(puzzle.field, "\n\nmoves:\n", puzzle.moves.path())
                         puzzle_made = True
                     elif show_solution in ["N", "n", "no", "No"]:
                         print("Good luck solving the puzzle! I won't spoil the fun by showing you a solution.")
                         puzzle_made = True
                     else:
                         print("Didn't understand that input, please input only 'Y' or 'N'.")
-            create_field(field_dimensions, [0])  #reset field
+            puzzle.reset_field()  #reset field
         if puzzle_made == False:
             print(f"Couldn't find a solution for a {field_dimensions} field within {max_process_time} seconds to create a puzzle from.")
             print("Please run create_puzzle again with different dimensions.")
@@ -386,18 +2214,76 @@ def create_puzzle(field_dimensions, number_of_digits = 1, max_process_time = 30)
     print("Thank you for playing DoPing, hope to see you back for another puzzle soon!")
     return "End of program"
 
-# measure start and end time when executing code
-start_time = time.process_time()
-
-#call solve to solve puzzle
-#solve([5,4])
-#call create_puzzle to create puzzle
-create_puzzle([4,5],4)
-
-end_time = time.process_time()
-result_time = (end_time - start_time)
-print(f"\nCode took {result_time}s to execute.")
-
-
+if __name__ == "__main__" and len(sys.argv) > 1: #command line use, see --help
+    parser = argparse.ArgumentParser(description="Decimals Of Pi In Neighbour Grid (DOPING)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="generate puzzles with exactly one solution as JSON lines, see generate_puzzles()")
+    generate.add_argument("rows", type=int)
+    generate.add_argument("columns", type=int)
+    generate.add_argument("--digits", type=int, default=1, help="number of random digits to pre-set before making the solution unique (default 1)")
+    generate.add_argument("--count", type=int, default=1, help="number of puzzles (default 1)")
+    generate.add_argument("--seed", type=int, default=None, help="seed to get the same puzzles again")
+    generate.add_argument("--workers", type=int, default=1, help="number of processes, 0 for all cpu cores (default 1)")
+    generate.add_argument("--max-process-time", type=float, default=30, help="maximum time in seconds to find a solution for each puzzle (default 30)")
+    generate.add_argument("--output", default="-", help="file to write the puzzles to, - (default) for the screen")
+    generate.add_argument("--binary", action="store_true", help="write the puzzles to --output as a storage file (see doping_storage.py) instead of JSON lines")
+    atlas = commands.add_parser("atlas", help="find out which fields up to rows x columns have a solution and store it in the atlas, see build_atlas()")
+    atlas.add_argument("rows", type=int)
+    atlas.add_argument("columns", type=int)
+    atlas.add_argument("--max-process-time", type=float, default=60, help="maximum time in seconds to search one field (default 60)")
+    bench = commands.add_parser("benchmark", help="time the search on a fixed set of seeded cases and compare with earlier results, see benchmark()")
+    bench.add_argument("--repeat", type=int, default=3, help="number of timed runs of every case, the fastest is kept (default 3)")
+    bench.add_argument("--max-process-time", type=float, default=30, help="maximum time in seconds for each run of a case (default 30)")
+    bench.add_argument("--no-memory", action="store_true", help="don't measure the peak memory use, which takes another run of every case")
+    bench.add_argument("--output", default="-", help="file to write the results to as JSON, - (default) for the screen")
+    bench.add_argument("--baseline", default=None, help="file with earlier results of the benchmark command to compare with. Exits with status 1 when a case got slower.")
+    bench.add_argument("--tolerance", type=float, default=0.1, help="allowed fraction of slowdown compared with --baseline (default 0.1)")
+    arguments = parser.parse_args()
+    if arguments.command == "atlas":
+        print(build_atlas(arguments.rows, arguments.columns, arguments.max_process_time), "fields were added to", atlas_file)
+    elif arguments.command == "benchmark":
+        results = benchmark(repeat=arguments.repeat, max_process_time=arguments.max_process_time, memory=not arguments.no_memory)
+        output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+        json.dump(results, output, indent=1)
+        output.write("\n")
+        if output is not sys.stdout:
+            output.close()
+        if arguments.baseline is not None:
+            with open(arguments.baseline) as f:
+                comparison = compare_benchmarks(results, json.load(f), arguments.tolerance)
+            for label, time_ratio, nodes_ratio, worse in comparison:
+                print(f"{label}: {time_ratio:.2f}x the time, {nodes_ratio:.2f}x the positions{', WORSE: ' + ', '.join(worse) if worse else ''}", file=sys.stderr)
+            if any(worse for label, time_ratio, nodes_ratio, worse in comparison):
+                sys.exit(1)
+    elif arguments.command == "generate":
+        if arguments.binary and arguments.output == "-":
+            parser.error("--binary needs a file to write to with --output")
+        records = generate_puzzles([arguments.rows, arguments.columns], arguments.digits, arguments.count, arguments.seed, arguments.workers, arguments.max_process_time)
+        try:
+            if arguments.binary:
+                from doping_storage import PuzzleWriter
+                with PuzzleWriter(arguments.output) as writer: #no storage file is written when a puzzle can't be made
+                    for record in records:
+                        writer.add(record["dimensions"], record["pre_set"], record["path"])
+            else:
+                output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+                try:
+                    for record in records:
+                        output.write(json.dumps(record) + "\n")
+                finally:
+                    if output is not sys.stdout:
+                        output.close()
+        except (TimeoutError, ValueError) as error: #exit with status 1, so a job that asked for the puzzles notices it didn't get them all
+            sys.exit(str(error))
+elif __name__ == "__main__": #only run when started as a program, not when imported (e.g. by the processes of the pool)
+    # measure start and end time when executing code
+    start_time = time.process_time()
 
+    #call solve to solve puzzle
+    #solve([5,4])
+    #call create_puzzle to create puzzle
+    create_puzzle([4,5],4)
 
+    end_time = time.process_time()
+    result_time = (end_time - start_time)
+    print(f"\nCode took {result_time}s to execute.")
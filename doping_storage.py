@@ -0,0 +1,250 @@
+'''
+Storage for DoPing puzzles (DOPING)
+
+Stores puzzles with their solutions in a compact binary file, so millions of them can be kept and any one of them can be read without loading the rest.
+Use PuzzleWriter to write a file (e.g. with the puzzles from generate_puzzles() in DOPING_v1.1.py) and PuzzleStore to read it.
+
+FILE LAYOUT:
+- Header: the magic bytes b"DOPING", the version, the number of sections and an index entry for every section.
+- Index entry: rows, columns, number of pre-set digits (clues), record size, number of records and offset of the section in the file.
+- Section: the records of all puzzles with the same dimensions and number of clues, one after the other. All records in a section have the same size, so puzzle #N is at offset + N * record size.
+- Record: the starting position (row * columns + column), a bit per position that is pre-set, the pre-set digits (4 bits each, in position order) and the path (2 bits per step: 0 right, 1 down, 2 left, 3 up).
+The digits of the solution are not stored, as they follow from the path (the n-th position of the path has the n-th digit of pi).
+All numbers are little endian.
+'''
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+magic = b"DOPING"
+version = 1
+header_format = struct.Struct("<6sHI") #magic, version, number of sections
+index_format = struct.Struct("<HHHHIQQ") #rows, columns, clues, (unused), record size, number of records, offset
+start_format = struct.Struct("<H") #starting position of a record
+directions = {(0, 1): 0, (1, 0): 1, (0, -1): 2, (-1, 0): 3} #step in [row, column] to its 2 bit code
+steps = [(0, 1), (1, 0), (0, -1), (-1, 0)] #2 bit code to its step in [row, column]
+
+def record_size(field_dimensions, clues):
+    """
+    :param field_dimensions: [number of rows, number of columns]
+    :param clues: number of pre-set digits
+    :return: number of bytes of a record: starting position, pre-set positions, pre-set digits and path
+    """
+    size = field_dimensions[0] * field_dimensions[1]
+    return start_format.size + (size + 7) // 8 + (clues + 1) // 2 + (2 * (size - 1) + 7) // 8
+
+def pack(field_dimensions, pre_set, path):
+    """
+    Packs one puzzle and its solution into a record.
+    :param field_dimensions: [number of rows, number of columns]
+    :param pre_set: pre-set digits in the format of solve(): [[[row, column], digit], ...] or [0]
+    :param path: route of the solution as [row, column] positions, e.g. from MoveStack.path()
+    :return: record as bytes
+    """
+    rows, columns = field_dimensions
+    size = rows * columns
+    if size > 1 << 16:
+        raise ValueError(f"A {field_dimensions} field has too many positions to store.")
+    if len(path) != size:
+        raise ValueError(f"The path has {len(path)} positions instead of {size}.")
+    clues = sorted((r * columns + c, digit) for (r, c), digit in ([] if pre_set == [0] else pre_set))
+    mask = 0 #bit per pre-set position
+    digits = 0 #4 bits per pre-set digit
+    for k, (i, digit) in enumerate(clues):
+        mask |= 1 << i
+        digits |= digit << (4 * k)
+    route = 0 #2 bits per step
+    for k in range(size - 1):
+        step = (path[k + 1][0] - path[k][0], path[k + 1][1] - path[k][1])
+        if step not in directions:
+            raise ValueError(f"The path goes from {list(path[k])} to {list(path[k + 1])}, which is not a move.")
+        route |= directions[step] << (2 * k)
+    return (start_format.pack(path[0][0] * columns + path[0][1])
+            + mask.to_bytes((size + 7) // 8, "little")
+            + digits.to_bytes((len(clues) + 1) // 2, "little")
+            + route.to_bytes((2 * (size - 1) + 7) // 8, "little"))
+
+def unpack(field_dimensions, clues, record):
+    """
+    Unpacks a record made by pack().
+    :param field_dimensions: [number of rows, number of columns]
+    :param clues: number of pre-set digits
+    :param record: bytes of the record
+    :return: (pre-set digits in the format of solve(), path as a tuple of [row, column] positions)
+    """
+    rows, columns = field_dimensions
+    size = rows * columns
+    mask_end = start_format.size + (size + 7) // 8
+    digits_end = mask_end + (clues + 1) // 2
+    start = start_format.unpack_from(record)[0]
+    mask = int.from_bytes(record[start_format.size: mask_end], "little")
+    digits = int.from_bytes(record[mask_end: digits_end], "little")
+    route = int.from_bytes(record[digits_end: record_size(field_dimensions, clues)], "little")
+    pre_set = []
+    for i in range(size):
+        if mask >> i & 1:
+            pre_set.append([[i // columns, i % columns], digits >> (4 * len(pre_set)) & 15])
+    path = [[start // columns, start % columns]]
+    for k in range(size - 1):
+        dr, dc = steps[route >> (2 * k) & 3]
+        path.append([path[-1][0] + dr, path[-1][1] + dc])
+    return (pre_set if pre_set else [0]), tuple(path)
+
+class PuzzleWriter:
+    """
+    Writes puzzles to a storage file. The records of every section are written to a temporary file as they are added and copied behind the header when closed, so the puzzles don't have to fit in memory.
+    Can be used as a context manager: with PuzzleWriter(file) as writer: writer.add(...)
+    """
+    __slots__ = ("file", "sections", "closed")
+
+    def __init__(self, file):
+        """
+        :param file: path of the storage file. An existing file is replaced when the writer is closed.
+        """
+        self.file = file
+        self.sections = {} #[temporary file, number of records] per (rows, columns, clues)
+        self.closed = False #True once closed or discarded, after which nothing is written anymore
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        if self.closed: #already closed (or discarded) within the with block
+            return
+        if exception[0] is None:
+            self.close()
+        else:
+            self.discard()
+
+    def add(self, field_dimensions, pre_set, path):
+        """
+        Add a puzzle with its solution, see pack().
+        :return: number of the puzzle within its section, to read it back with PuzzleStore
+        """
+        if self.closed:
+            raise ValueError(f"Can't add a puzzle to {self.file}, as the writer is closed.")
+        record = pack(field_dimensions, pre_set, path)
+        key = (field_dimensions[0], field_dimensions[1], 0 if pre_set == [0] else len(pre_set))
+        if key not in self.sections: #temporary file next to the storage file, removed when closed
+            self.sections[key] = [tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.file))), 0]
+        section = self.sections[key]
+        section[0].write(record)
+        section[1] += 1
+        return section[1] - 1
+
+    def close(self):
+        """
+        Write the header and copy all sections behind it. The file is written under another name first, so readers never see half a file.
+        Closing again does nothing, so the file is not replaced by an empty one.
+        """
+        if self.closed:
+            return
+        offset = header_format.size + index_format.size * len(self.sections)
+        index = []
+        for (rows, columns, clues), (section, count) in sorted(self.sections.items()):
+            size = record_size([rows, columns], clues)
+            index.append(index_format.pack(rows, columns, clues, 0, size, count, offset))
+            offset += count * size
+        try:
+            with open(self.file + ".tmp", "wb") as f:
+                f.write(header_format.pack(magic, version, len(self.sections)))
+                f.write(b"".join(index))
+                for key in sorted(self.sections):
+                    section = self.sections[key][0]
+                    section.seek(0)
+                    shutil.copyfileobj(section, f)
+            os.replace(self.file + ".tmp", self.file)
+        finally:
+            self.discard()
+
+    def discard(self):
+        """
+        Remove the temporary files without writing the storage file, e.g. when generating the puzzles failed.
+        """
+        for section, count in self.sections.values():
+            section.close()
+        self.sections = {}
+        self.closed = True
+
+class PuzzleStore:
+    """
+    Reads puzzles from a storage file made by PuzzleWriter. Only the header is read when opening, the records are read from the memory-mapped file when asked for.
+    Can be used as a context manager: with PuzzleStore(file) as store: store.pre_set(...)
+    """
+    __slots__ = ("file", "data", "index")
+
+    def __init__(self, file):
+        """
+        :param file: path of the storage file
+        """
+        with open(file, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.file = file
+        file_magic, file_version, sections = header_format.unpack_from(self.data)
+        if file_magic != magic or file_version != version:
+            self.data.close()
+            raise ValueError(f"{file} is not a DoPing storage file of version {version}.")
+        self.index = {} #(record size, number of records, offset) per (rows, columns, clues)
+        for k in range(sections):
+            rows, columns, clues, unused, size, count, offset = index_format.unpack_from(self.data, header_format.size + k * index_format.size)
+            self.index[(rows, columns, clues)] = (size, count, offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def __len__(self):
+        return sum(count for size, count, offset in self.index.values())
+
+    def close(self):
+        self.data.close()
+
+    def sections(self):
+        """
+        :return: dictionary with the number of puzzles per (rows, columns, clues)
+        """
+        return {key: count for key, (size, count, offset) in self.index.items()}
+
+    def count(self, field_dimensions, clues):
+        """
+        :return: number of puzzles stored with these dimensions and number of pre-set digits
+        """
+        return self.index.get((field_dimensions[0], field_dimensions[1], clues), (0, 0, 0))[1]
+
+    def record(self, field_dimensions, clues, n):
+        """
+        :param field_dimensions: [number of rows, number of columns]
+        :param clues: number of pre-set digits
+        :param n: number of the puzzle within the section
+        :return: bytes of the record, see pack()
+        """
+        key = (field_dimensions[0], field_dimensions[1], clues)
+        if key not in self.index or not 0 <= n < self.index[key][1]:
+            raise IndexError(f"There is no puzzle #{n} for a {list(field_dimensions)} field with {clues} pre-set digits in {self.file}.")
+        size, count, offset = self.index[key]
+        return self.data[offset + n * size: offset + (n + 1) * size]
+
+    def puzzle(self, field_dimensions, clues, n):
+        """
+        :return: (pre-set digits in the format of solve(), path of the solution) of puzzle #n, see record()
+        """
+        return unpack(field_dimensions, clues, self.record(field_dimensions, clues, n))
+
+    def pre_set(self, field_dimensions, clues, n):
+        """
+        :return: pre-set digits of puzzle #n in the format of solve(), e.g. solve(field_dimensions, store.pre_set(field_dimensions, clues, n))
+        """
+        return self.puzzle(field_dimensions, clues, n)[0]
+
+def load_puzzle(file, field_dimensions, clues, n):
+    """
+    Reads one puzzle from a storage file, see PuzzleStore.puzzle().
+    :return: (pre-set digits in the format of solve(), path of the solution)
+    """
+    with PuzzleStore(file) as store:
+        return store.puzzle(field_dimensions, clues, n)